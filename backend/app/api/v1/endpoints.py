@@ -200,17 +200,10 @@ async def generate_cover_letter_pdf(
     try:
         import base64
         from datetime import datetime
-        from jinja2 import Environment, FileSystemLoader
         from weasyprint import HTML
         
-        # Initialize Jinja2 environment for this endpoint
-        jinja_env = Environment(
-            loader=FileSystemLoader('app/templates'),
-            autoescape=True
-        )
-        
-        # Load cover letter template
-        letter_template = jinja_env.get_template('letter_template.html')
+        # Load cover letter template from the generator's shared environment
+        letter_template = cv_service.jinja_env.get_template('letter_template.html')
         
         # Prepare template data with current date
         template_data = cover_letter_data.copy()
@@ -9,9 +9,10 @@ from datetime import datetime
 import uuid
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Request, Query
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse, FileResponse
 from pydantic import BaseModel
 import io
+import os
 
 from app.core.config import settings
 from app.schemas.models import CVFormData, PDFResponse, ErrorResponse
@@ -29,6 +30,18 @@ from app.templates.industry_templates import template_library
 # Initialize router
 router = APIRouter()
 
+class SpooledFileResponse(FileResponse):
+    """File response that deletes its file afterwards, even if the client disconnects"""
+    
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
 # Request/Response Models
 class OptimizationRequest(BaseModel):
     cv_data: Dict[str, Any]
@@ -200,7 +213,7 @@ async def analyze_ats_compatibility(
 ):
     """Comprehensive ATS compatibility analysis"""
     try:
-        result = ats_service.analyze_ats_compatibility(
+        result = await ats_service.analyze_ats_compatibility_async(
             request.cv_data,
             request.job_description,
             request.industry
@@ -368,7 +381,8 @@ async def export_cv_multi_format(
             template=request.template,
             include_contact_info=request.include_contact_info,
             page_size=request.page_size,
-            margins=request.margins or {"top": 20, "bottom": 20, "left": 20, "right": 20}
+            margins=request.margins or {"top": 20, "bottom": 20, "left": 20, "right": 20},
+            streaming=True
         )
         
         result = await export_service.export_cv(request.cv_data, settings)
@@ -379,6 +393,14 @@ async def export_cv_multi_format(
                 detail=result.error_message or "Export failed"
             )
         
+        # Send the spooled file straight from disk, removing it once the response ends
+        if result.file_path:
+            return SpooledFileResponse(
+                result.file_path,
+                media_type=result.content_type,
+                headers={"Content-Disposition": f"attachment; filename={result.filename}"}
+            )
+        
         # Return file as streaming response
         return StreamingResponse(
             io.BytesIO(result.file_data),
@@ -0,0 +1,9 @@
+"""
+Interpreter feature switches shared across services
+"""
+
+import sys
+
+# Dataclass keyword arguments that drop the per-instance __dict__ on interpreters
+# supporting slotted dataclasses (3.10+); empty on older ones
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -43,6 +43,7 @@ class Settings(BaseSettings):
     
     # PDF generation settings
     PDF_TIMEOUT: int = int(os.getenv("PDF_TIMEOUT", "30"))  # seconds
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "2"))  # worker processes, 0 renders in-process
     
     class Config:
         env_file = ".env"
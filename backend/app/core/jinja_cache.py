@@ -0,0 +1,26 @@
+"""
+Jinja2 bytecode cache shared by the template-rendering services
+"""
+
+import logging
+from typing import Optional
+
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+
+def create_bytecode_cache(pattern: str = "__jinja2_%s.cache") -> Optional[FileSystemBytecodeCache]:
+    """Bytecode cache in Jinja's per-user temp directory, or None if that is unusable
+    
+    Without an explicit directory Jinja creates ``_jinja2-cache-<uid>`` with mode
+    0700 and refuses it unless this user owns it, so other local users cannot
+    plant compiled templates there. Environments sharing the directory need
+    distinct patterns when their settings (e.g. autoescape) differ, since the
+    cache key covers only the template name and file.
+    """
+    try:
+        return FileSystemBytecodeCache(pattern=pattern)
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Jinja bytecode cache disabled: {e}")
+        return None
@@ -6,14 +6,80 @@ Free and open-source CV performance tracking and insights
 import asyncio
 import json
 import logging
-from datetime import datetime, timedelta
+import pickle
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
-from enum import Enum
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from collections import Counter, defaultdict, deque
+from operator import attrgetter, itemgetter
+from bisect import bisect_left, bisect_right, insort
+from types import MappingProxyType
 import statistics
 
+import numpy as np
+
+from app.core.compat import DATACLASS_SLOTS
+
+# Optional JIT compilation for the numeric kernels. Compiled code is not cached
+# on disk: deployments such as the Vercel bundle have no writable cache location,
+# and numba then fails at import instead of falling back.
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the kernel as plain Python"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Indexed by datetime.weekday(); avoids strftime("%A") in the tallies
+_WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Raw events/applications older than this are evicted; derived metrics are kept
+EVENT_RETENTION_DAYS = 180
+# Eviction runs once the oldest entry is this far past the window, so it happens in batches
+_RETENTION_SLACK = timedelta(days=1)
+
+# Newest events kept ready for the dashboard's recent-activity list
+_RECENT_ACTIVITY_LIMIT = 10
+
+# Identical dashboard requests within the same time bucket are served from cache
+DASHBOARD_CACHE_SECONDS = 60
+_DASHBOARD_CACHE_SIZE = 10000
+
+# Users are spread over this many independently locked shards
+ANALYTICS_SHARD_COUNT = 16
+
+def _to_ns(moment: datetime) -> int:
+    """Integer nanoseconds since the epoch, ordered exactly like the datetimes"""
+    epoch = _EPOCH if moment.tzinfo is None else _EPOCH_UTC
+    return (moment - epoch) // _ONE_MICROSECOND * 1000
+
+def _timeframe_window(timeframe_days: int, now: datetime) -> Dict[str, Any]:
+    """The ``timeframe`` block of a response, for the window ending at now"""
+    return {
+        "days": timeframe_days,
+        "start_date": (now - timedelta(days=timeframe_days)).isoformat(),
+        "end_date": now.isoformat()
+    }
+
+def _insort_parallel(keys: List[Any], items: List[Any], key: Any, item: Any) -> None:
+    """Insert item into items, keeping both lists ordered by the parallel sorted keys"""
+    index = bisect_right(keys, key)
+    keys.insert(index, key)
+    items.insert(index, item)
+
 class EventType(Enum):
     CV_CREATED = "cv_created"
     CV_UPDATED = "cv_updated"
@@ -38,7 +104,81 @@ class MetricType(Enum):
     ATS_SCORE = "ats_score"
     OPTIMIZATION_SCORE = "optimization_score"
 
-@dataclass
+class ApplicationStage(IntEnum):
+    """Funnel position of an application status; later stages compare greater"""
+    REJECTED = -1
+    APPLIED = 0
+    VIEWED = 1
+    INTERVIEW_SCHEDULED = 2
+    INTERVIEW_COMPLETED = 3
+    OFFERED = 4
+
+# Unknown statuses sit at APPLIED: they count as neither a response nor an interview
+_STAGE_BY_STATUS = {
+    "applied": ApplicationStage.APPLIED,
+    "viewed": ApplicationStage.VIEWED,
+    "interview_scheduled": ApplicationStage.INTERVIEW_SCHEDULED,
+    "interview_completed": ApplicationStage.INTERVIEW_COMPLETED,
+    "offered": ApplicationStage.OFFERED,
+    "rejected": ApplicationStage.REJECTED
+}
+
+# Plain-int stage values for the numeric kernels and funnel counts
+_STAGE_VIEWED = int(ApplicationStage.VIEWED)
+_STAGE_INTERVIEW_SCHEDULED = int(ApplicationStage.INTERVIEW_SCHEDULED)
+_STAGE_INTERVIEW_COMPLETED = int(ApplicationStage.INTERVIEW_COMPLETED)
+_STAGE_OFFERED = int(ApplicationStage.OFFERED)
+
+# Sort priority of insight impact levels (unknown levels rank last)
+_IMPACT_PRIORITY = defaultdict(int, {"high": 3, "medium": 2, "low": 1})
+
+# Integer codes for metric types, used by the numeric kernels
+_METRIC_CODES = {metric_type: code for code, metric_type in enumerate(MetricType)}
+_CODE_INTERVIEW_RATE = _METRIC_CODES[MetricType.INTERVIEW_RATE]
+_CODE_RESPONSE_RATE = _METRIC_CODES[MetricType.RESPONSE_RATE]
+_CODE_ATS_SCORE = _METRIC_CODES[MetricType.ATS_SCORE]
+_CODE_OPTIMIZATION_SCORE = _METRIC_CODES[MetricType.OPTIMIZATION_SCORE]
+
+@njit
+def _score_week(week_vals, metric_codes):
+    """Normalize per-metric weekly averages to 0-1 and return their mean"""
+    count = week_vals.shape[0]
+    if count == 0:
+        return 0.0
+    
+    total = 0.0
+    for i in range(count):
+        code = metric_codes[i]
+        value = week_vals[i]
+        
+        # Normalize scores (this is simplified - in practice you'd use proper normalization)
+        if code == _CODE_ATS_SCORE or code == _CODE_OPTIMIZATION_SCORE:
+            normalized = value / 100.0  # Scores are 0-100
+        elif code == _CODE_INTERVIEW_RATE:
+            normalized = min(value / 50.0, 1.0)  # Cap at 50% interview rate
+        elif code == _CODE_RESPONSE_RATE:
+            normalized = min(value / 80.0, 1.0)  # Cap at 80% response rate
+        else:
+            # For count metrics, use logarithmic scaling
+            normalized = min(value / 10.0, 1.0)
+        total += normalized
+    
+    return total / count
+
+def _funnel_counts(stages):
+    """Applications that reached viewed, interview scheduled/completed and offered
+    
+    Later stages also count towards every earlier stage. Each count is one
+    vectorized comparison over the int8 stage column, so no JIT is needed.
+    """
+    return (
+        int(np.count_nonzero(stages >= _STAGE_VIEWED)),
+        int(np.count_nonzero(stages >= _STAGE_INTERVIEW_SCHEDULED)),
+        int(np.count_nonzero(stages >= _STAGE_INTERVIEW_COMPLETED)),
+        int(np.count_nonzero(stages == _STAGE_OFFERED))
+    )
+
+@dataclass(**DATACLASS_SLOTS)
 class AnalyticsEvent:
     event_id: str
     user_id: str
@@ -49,8 +189,22 @@ class AnalyticsEvent:
     source: str = "web"  # web, mobile, api
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
+    timestamp_ns: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.timestamp_ns = _to_ns(self.timestamp)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Public fields for API responses"""
+        return {
+            "event_id": self.event_id,
+            "event_type": self.event_type.value,
+            "timestamp": self.timestamp.isoformat(),
+            "metadata": self.metadata,
+            "source": self.source
+        }
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PerformanceMetric:
     metric_type: MetricType
     value: float
@@ -58,7 +212,7 @@ class PerformanceMetric:
     cv_id: str
     period: str = "daily"  # daily, weekly, monthly
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ApplicationTracking:
     application_id: str
     cv_id: str
@@ -70,6 +224,88 @@ class ApplicationTracking:
     ats_score: Optional[float] = None
     response_time_days: Optional[int] = None
     notes: Optional[str] = None
+    # Derived at construction from application_date/status for the hot filters
+    application_date_ns: int = field(init=False, repr=False, compare=False)
+    application_weekday: int = field(init=False, repr=False, compare=False)
+    stage: ApplicationStage = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.application_date_ns = _to_ns(self.application_date)
+        self.application_weekday = self.application_date.weekday()
+        self.stage = _STAGE_BY_STATUS.get(self.status, ApplicationStage.APPLIED)
+
+class _ActivityLog:
+    """
+    Time-ordered events and applications for one user, one user's CV, or the whole store
+    
+    The parallel key lists hold nanoseconds since the epoch so that timeframe cuts
+    are binary searches, and event timestamps are also partitioned by event type so
+    per-type window counts are two bisects. Callers treat the lists as read-only
+    views. The columnar NumPy copy of the applications is built on demand and cached
+    until the log next changes, and the newest events are mirrored in a short deque
+    for the recent-activity list.
+    """
+    
+    __slots__ = ("events", "event_timestamps", "timestamps_by_type", "applications",
+                 "application_dates", "recent_events", "_application_columns")
+    
+    def __init__(self):
+        self.events: List[AnalyticsEvent] = []
+        self.event_timestamps: List[int] = []
+        self.timestamps_by_type: Dict[EventType, List[int]] = {}
+        self.applications: List[ApplicationTracking] = []
+        self.application_dates: List[int] = []
+        self.recent_events: deque = deque(maxlen=_RECENT_ACTIVITY_LIMIT)  # oldest first
+        self._application_columns: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    
+    def add_event(self, event: AnalyticsEvent):
+        _insort_parallel(self.event_timestamps, self.events, event.timestamp_ns, event)
+        insort(self.timestamps_by_type.setdefault(event.event_type, []), event.timestamp_ns)
+        if self.events[-1] is event:
+            self.recent_events.append(event)
+        elif (len(self.events) <= _RECENT_ACTIVITY_LIMIT
+              or event.timestamp_ns >= self.event_timestamps[-_RECENT_ACTIVITY_LIMIT]):
+            # Late arrival that still lands among the newest events
+            self._refresh_recent_events()
+    
+    def _refresh_recent_events(self):
+        self.recent_events = deque(self.events[-_RECENT_ACTIVITY_LIMIT:], maxlen=_RECENT_ACTIVITY_LIMIT)
+    
+    def add_application(self, application: ApplicationTracking):
+        _insort_parallel(self.application_dates, self.applications,
+                         application.application_date_ns, application)
+        self._application_columns = None
+    
+    def application_columns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(application dates int64, funnel stages int8) arrays, in time order"""
+        if self._application_columns is None:
+            count = len(self.applications)
+            self._application_columns = (
+                np.fromiter(self.application_dates, dtype=np.int64, count=count),
+                np.fromiter((a.stage for a in self.applications), dtype=np.int8, count=count)
+            )
+        return self._application_columns
+    
+    def oldest_ns(self) -> Optional[int]:
+        """Timestamp of the oldest event or application, if any"""
+        heads = [keys[0] for keys in (self.event_timestamps, self.application_dates) if keys]
+        return min(heads) if heads else None
+    
+    def prune(self, cutoff_ns: int):
+        """Drop every event and application older than cutoff_ns"""
+        for keys, items in ((self.event_timestamps, self.events),
+                            (self.application_dates, self.applications)):
+            expired = bisect_left(keys, cutoff_ns)
+            if expired:
+                del keys[:expired]
+                del items[:expired]
+        for keys in self.timestamps_by_type.values():
+            del keys[:bisect_left(keys, cutoff_ns)]
+        self._refresh_recent_events()
+        self._application_columns = None
+    
+    def is_empty(self) -> bool:
+        return not self.events and not self.applications
 
 @dataclass
 class CompetitorBenchmark:
@@ -82,7 +318,7 @@ class CompetitorBenchmark:
     sample_size: int
     last_updated: datetime
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PerformanceInsight:
     insight_type: str
     title: str
@@ -91,6 +327,18 @@ class PerformanceInsight:
     actionable_steps: List[str]
     data_points: Dict[str, Any]
     confidence: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary without the recursive copy of dataclasses.asdict"""
+        return {
+            "insight_type": self.insight_type,
+            "title": self.title,
+            "description": self.description,
+            "impact_level": self.impact_level,
+            "actionable_steps": list(self.actionable_steps),
+            "data_points": dict(self.data_points),
+            "confidence": self.confidence
+        }
 
 class MetricsCalculator:
     """
@@ -111,17 +359,33 @@ class MetricsCalculator:
     
     def calculate_metric(self, metric_type: MetricType, events: List[AnalyticsEvent], 
                         applications: List[ApplicationTracking] = None,
-                        timeframe_days: int = 30) -> float:
-        """Calculate a specific metric from events and applications"""
+                        timeframe_days: int = 30,
+                        event_timestamps: List[int] = None,
+                        application_dates: List[int] = None,
+                        now: Optional[datetime] = None) -> float:
+        """Calculate a specific metric from events and applications
+        
+        When the sorted ``event_timestamps``/``application_dates`` parallel lists
+        (nanoseconds since the epoch) are given, ``events``/``applications`` are
+        assumed to be in the same order and the timeframe cut is a binary search
+        instead of a full scan. ``now`` lets callers share one reference time.
+        """
         
         # Filter events by timeframe
-        cutoff_date = datetime.now() - timedelta(days=timeframe_days)
-        filtered_events = [e for e in events if e.timestamp >= cutoff_date]
-        
-        if applications:
-            filtered_applications = [a for a in applications if a.application_date >= cutoff_date]
+        if now is None:
+            now = datetime.now()
+        cutoff_ns = _to_ns(now - timedelta(days=timeframe_days))
+        if event_timestamps is not None:
+            filtered_events = events[bisect_left(event_timestamps, cutoff_ns):]
         else:
+            filtered_events = [e for e in events if e.timestamp_ns >= cutoff_ns]
+        
+        if not applications:
             filtered_applications = []
+        elif application_dates is not None:
+            filtered_applications = applications[bisect_left(application_dates, cutoff_ns):]
+        else:
+            filtered_applications = [a for a in applications if a.application_date_ns >= cutoff_ns]
         
         calculator = self.metric_definitions.get(metric_type)
         if not calculator:
@@ -155,8 +419,7 @@ class MetricsCalculator:
         if not applications:
             return 0.0
         
-        interview_statuses = ["interview_scheduled", "interview_completed", "offered"]
-        interviews = len([a for a in applications if a.status in interview_statuses])
+        interviews = len([a for a in applications if a.stage >= ApplicationStage.INTERVIEW_SCHEDULED])
         
         return (interviews / len(applications)) * 100 if applications else 0.0
     
@@ -166,8 +429,7 @@ class MetricsCalculator:
         if not applications:
             return 0.0
         
-        response_statuses = ["viewed", "interview_scheduled", "interview_completed", "offered", "rejected"]
-        responses = len([a for a in applications if a.status in response_statuses])
+        responses = len([a for a in applications if a.stage != ApplicationStage.APPLIED])
         
         return (responses / len(applications)) * 100 if applications else 0.0
     
@@ -203,11 +465,108 @@ class MetricsCalculator:
         
         return statistics.mean(scores) if scores else 0.0
 
+class _TrendState:
+    """
+    Running trend summary for one (cv_id, metric_type) stream, updated in O(1)
+    """
+    
+    __slots__ = ("first7", "last7", "count", "mean", "m2",
+                 "current_value", "previous_value", "last_timestamp", "ordered")
+    
+    def __init__(self):
+        self.first7: List[float] = []  # Sealed once it holds 7 values
+        self.last7: deque = deque(maxlen=7)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Welford sum of squared deviations
+        self.current_value = None
+        self.previous_value = None
+        self.last_timestamp: Optional[datetime] = None
+        self.ordered = True
+    
+    def update(self, metric: "PerformanceMetric"):
+        """Fold one metric value into the running summary"""
+        if self.last_timestamp is not None and metric.timestamp < self.last_timestamp:
+            # Late arrivals break the first/last windows; callers fall back to a full recompute
+            self.ordered = False
+        self.last_timestamp = metric.timestamp
+        
+        value = metric.value
+        if len(self.first7) < 7:
+            self.first7.append(value)
+        self.last7.append(value)
+        self.previous_value = self.current_value
+        self.current_value = value
+        
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Build the trend entry for this stream"""
+        if self.count < 2:
+            return {
+                "trend": "insufficient_data",
+                "change_percentage": 0,
+                "current_value": self.current_value,
+                "data_points": self.count
+            }
+        
+        recent_avg = statistics.mean(self.last7) if self.count >= 7 else self.current_value
+        older_avg = statistics.mean(self.first7) if self.count >= 14 else self.first7[0]
+        return TrendAnalyzer._summarize_trend(recent_avg, older_avg, self.current_value,
+                                              self.previous_value, self.count,
+                                              self.m2 / (self.count - 1))
+
 class TrendAnalyzer:
     """
     Analyze trends and patterns in CV performance
     """
     
+    def __init__(self):
+        # Incremental trend summaries per CV, in first-seen metric type order
+        self._trend_state: Dict[str, Dict[MetricType, _TrendState]] = {}
+    
+    def record_metric(self, metric: PerformanceMetric):
+        """Update the incremental trend summary with a newly generated metric"""
+        cv_states = self._trend_state.setdefault(metric.cv_id, {})
+        state = cv_states.get(metric.metric_type)
+        if state is None:
+            state = cv_states[metric.metric_type] = _TrendState()
+        state.update(metric)
+    
+    def get_cached_trends(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        """Trends for a single CV from the running summaries, or None if a recompute is needed"""
+        cv_states = self._trend_state.get(cv_id)
+        if not cv_states:
+            return {}
+        if not all(state.ordered for state in cv_states.values()):
+            return None
+        return {metric_type.value: state.summary() for metric_type, state in cv_states.items()}
+    
+    @staticmethod
+    def _summarize_trend(recent_avg: float, older_avg: float, current_value: float,
+                         previous_value: float, data_points: int, variance: float) -> Dict[str, Any]:
+        """Classify a trend from its recent and older averages"""
+        change_percentage = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
+        
+        if change_percentage > 10:
+            trend = "improving"
+        elif change_percentage < -10:
+            trend = "declining"
+        else:
+            trend = "stable"
+        
+        return {
+            "trend": trend,
+            "change_percentage": round(change_percentage, 2),
+            "current_value": current_value,
+            "previous_value": previous_value,
+            "data_points": data_points,
+            "variance": round(variance, 2)
+        }
+    
     def analyze_performance_trends(self, metrics: List[PerformanceMetric], 
                                  timeframe_days: int = 90) -> Dict[str, Any]:
         """Analyze performance trends over time"""
@@ -223,7 +582,7 @@ class TrendAnalyzer:
         
         for metric_type, metric_list in metrics_by_type.items():
             # Sort by timestamp
-            metric_list.sort(key=lambda x: x.timestamp)
+            metric_list.sort(key=attrgetter("timestamp"))
             
             if len(metric_list) < 2:
                 trends[metric_type.value] = {
@@ -238,27 +597,13 @@ class TrendAnalyzer:
             values = [m.value for m in metric_list]
             
             # Simple linear trend
-            if len(values) >= 2:
-                recent_avg = statistics.mean(values[-7:]) if len(values) >= 7 else values[-1]
-                older_avg = statistics.mean(values[:7]) if len(values) >= 14 else values[0]
-                
-                change_percentage = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
-                
-                if change_percentage > 10:
-                    trend = "improving"
-                elif change_percentage < -10:
-                    trend = "declining"
-                else:
-                    trend = "stable"
-                
-                trends[metric_type.value] = {
-                    "trend": trend,
-                    "change_percentage": round(change_percentage, 2),
-                    "current_value": values[-1],
-                    "previous_value": values[-2] if len(values) >= 2 else values[-1],
-                    "data_points": len(values),
-                    "variance": round(statistics.variance(values) if len(values) > 1 else 0, 2)
-                }
+            recent_avg = statistics.mean(values[-7:]) if len(values) >= 7 else values[-1]
+            older_avg = statistics.mean(values[:7]) if len(values) >= 14 else values[0]
+            
+            trends[metric_type.value] = self._summarize_trend(
+                recent_avg, older_avg, values[-1], values[-2], len(values),
+                statistics.variance(values)
+            )
         
         return trends
     
@@ -287,31 +632,16 @@ class TrendAnalyzer:
         
         # Calculate weekly scores
         for week_data in weekly_performance.values():
-            total_score = 0
-            metric_count = 0
-            
-            for metric_type, values in week_data["metrics"].items():
-                avg_value = statistics.mean(values)
-                
-                # Normalize scores (this is simplified - in practice you'd use proper normalization)
-                if metric_type in [MetricType.ATS_SCORE, MetricType.OPTIMIZATION_SCORE]:
-                    normalized = avg_value / 100  # Scores are 0-100
-                elif metric_type == MetricType.INTERVIEW_RATE:
-                    normalized = min(avg_value / 50, 1)  # Cap at 50% interview rate
-                elif metric_type == MetricType.RESPONSE_RATE:
-                    normalized = min(avg_value / 80, 1)  # Cap at 80% response rate
-                else:
-                    # For count metrics, use logarithmic scaling
-                    normalized = min(avg_value / 10, 1)
-                
-                total_score += normalized
-                metric_count += 1
-            
-            week_data["total_score"] = total_score / metric_count if metric_count > 0 else 0
+            week_metrics = week_data["metrics"]
+            week_vals = np.fromiter((statistics.mean(values) for values in week_metrics.values()),
+                                    dtype=np.float64, count=len(week_metrics))
+            metric_codes = np.fromiter((_METRIC_CODES[metric_type] for metric_type in week_metrics),
+                                       dtype=np.int64, count=len(week_metrics))
+            week_data["total_score"] = float(_score_week(week_vals, metric_codes))
         
         # Find top performing weeks
         sorted_weeks = sorted(weekly_performance.values(), 
-                            key=lambda x: x["total_score"], reverse=True)
+                            key=itemgetter("total_score"), reverse=True)
         
         return sorted_weeks[:5]  # Top 5 weeks
 
@@ -346,11 +676,12 @@ class InsightGenerator:
             except Exception as e:
                 logger.error(f"Error generating insights with rule {rule.__name__}: {e}")
         
-        # Sort by impact level and confidence
-        impact_priority = {"high": 3, "medium": 2, "low": 1}
-        insights.sort(key=lambda x: (impact_priority.get(x.impact_level, 0), x.confidence), reverse=True)
+        # Sort by impact level and confidence; the negated index keeps ties in rule order
+        ranked = [(_IMPACT_PRIORITY[insight.impact_level], insight.confidence, -index, insight)
+                  for index, insight in enumerate(insights)]
+        ranked.sort(reverse=True)
         
-        return insights[:10]  # Return top 10 insights
+        return [entry[3] for entry in ranked[:10]]  # Return top 10 insights
     
     def _analyze_ats_performance(self, metrics: List[PerformanceMetric], 
                                events: List[AnalyticsEvent], applications: List[ApplicationTracking],
@@ -417,7 +748,7 @@ class InsightGenerator:
             return insights
         
         # Calculate success metrics
-        interview_rate = len([a for a in applications if a.status in ["interview_scheduled", "interview_completed", "offered"]]) / len(applications) * 100
+        interview_rate = len([a for a in applications if a.stage >= ApplicationStage.INTERVIEW_SCHEDULED]) / len(applications) * 100
         response_rate = len([a for a in applications if a.status != "applied"]) / len(applications) * 100
         
         if interview_rate < 10:
@@ -475,17 +806,22 @@ class InsightGenerator:
         if not template_changes:
             return insights
         
+        # Order applications once so each window is two binary searches
+        applications = sorted(applications, key=attrgetter("application_date"))
+        application_dates = [a.application_date for a in applications]
+        
         # Analyze performance before and after template changes
         for i, change_event in enumerate(template_changes):
             before_date = change_event.timestamp - timedelta(days=30)
             after_date = change_event.timestamp + timedelta(days=30)
             
-            before_applications = [a for a in applications if before_date <= a.application_date < change_event.timestamp]
-            after_applications = [a for a in applications if change_event.timestamp <= a.application_date <= after_date]
+            change_index = bisect_left(application_dates, change_event.timestamp)
+            before_applications = applications[bisect_left(application_dates, before_date):change_index]
+            after_applications = applications[change_index:bisect_right(application_dates, after_date)]
             
             if len(before_applications) >= 3 and len(after_applications) >= 3:
-                before_interview_rate = len([a for a in before_applications if a.status in ["interview_scheduled", "interview_completed", "offered"]]) / len(before_applications) * 100
-                after_interview_rate = len([a for a in after_applications if a.status in ["interview_scheduled", "interview_completed", "offered"]]) / len(after_applications) * 100
+                before_interview_rate = len([a for a in before_applications if a.stage >= ApplicationStage.INTERVIEW_SCHEDULED]) / len(before_applications) * 100
+                after_interview_rate = len([a for a in after_applications if a.stage >= ApplicationStage.INTERVIEW_SCHEDULED]) / len(after_applications) * 100
                 
                 improvement = after_interview_rate - before_interview_rate
                 
@@ -522,14 +858,12 @@ class InsightGenerator:
         if len(view_events) < 10:
             return insights
         
-        # Analyze viewing times
-        view_hours = [e.timestamp.hour for e in view_events]
-        peak_hour = max(set(view_hours), key=view_hours.count)
+        # Analyze viewing times (single bincount pass over the 24 hour buckets)
+        view_hours = np.fromiter((e.timestamp.hour for e in view_events), dtype=np.int8, count=len(view_events))
+        peak_hour = int(np.bincount(view_hours, minlength=24).argmax())
         
         # Analyze viewing sources
-        sources = [e.metadata.get("source", "unknown") for e in view_events]
-        source_counts = {source: sources.count(source) for source in set(sources)}
-        top_source = max(source_counts.items(), key=lambda x: x[1])
+        top_source = Counter(e.metadata.get("source", "unknown") for e in view_events).most_common(1)[0]
         
         insights.append(PerformanceInsight(
             insight_type="viewing_patterns",
@@ -618,29 +952,205 @@ class InsightGenerator:
         
         return insights
 
+# Report recommendations: (summary key, threshold, recommendation) issued when
+# the summary value is below the threshold. The templates are read-only and
+# shared; each report gets its own plain dict and list copies.
+_RECOMMENDATION_RULES = (
+    ("ats_score", 70, MappingProxyType({
+        "type": "ats_improvement",
+        "priority": "high",
+        "title": "Improve ATS Compatibility",
+        "description": "Your ATS score is below optimal. Focus on keyword optimization and formatting.",
+        "action_items": (
+            "Add more industry-relevant keywords",
+            "Use standard section headings",
+            "Include quantifiable achievements"
+        )
+    })),
+    ("interview_rate", 10, MappingProxyType({
+        "type": "interview_improvement",
+        "priority": "high",
+        "title": "Increase Interview Rate",
+        "description": "Your interview rate is below average. Consider CV optimization and targeting.",
+        "action_items": (
+            "Tailor CV to each job posting",
+            "Improve professional summary",
+            "Add more relevant achievements"
+        )
+    })),
+    ("total_applications", 10, MappingProxyType({
+        "type": "activity_increase",
+        "priority": "medium",
+        "title": "Increase Application Activity",
+        "description": "More applications can lead to better insights and opportunities.",
+        "action_items": (
+            "Set a target of 5-10 applications per week",
+            "Use job boards and networking",
+            "Track application outcomes"
+        )
+    }))
+)
+
+class _AnalyticsShard:
+    """
+    Tracked activity and cached dashboards for a subset of users
+    
+    Events and applications are kept ordered by time in a shard-wide log, plus
+    per-user and per-(user, CV) indexes so requests only touch one user's slice.
+    Mutations hold the shard's lock; dashboard reads only take it around the cache.
+    """
+    
+    def __init__(self, retention: timedelta):
+        self.retention = retention
+        self.lock = threading.Lock()
+        
+        self.activity = _ActivityLog()
+        self.activity_by_user: Dict[str, _ActivityLog] = {}
+        self.activity_by_cv: Dict[str, Dict[str, _ActivityLog]] = {}
+        
+        # Pickled dashboard responses for the current time bucket, keyed by the
+        # request and the data versions they were built from; the per-user
+        # versions are bumped whenever that user's activity changes
+        self.dashboard_cache: Dict[Tuple, bytes] = {}
+        self.dashboard_cache_bucket: Optional[int] = None
+        self.user_versions: Dict[str, int] = defaultdict(int)
+    
+    def add_event(self, event: AnalyticsEvent):
+        for log in self._logs_for(event.user_id, event.cv_id):
+            log.add_event(event)
+        self.user_versions[event.user_id] += 1
+    
+    def add_application(self, application: ApplicationTracking):
+        for log in self._logs_for(application.user_id, application.cv_id):
+            log.add_application(application)
+        self.user_versions[application.user_id] += 1
+    
+    def _logs_for(self, user_id: str, cv_id: str) -> Tuple[_ActivityLog, _ActivityLog, _ActivityLog]:
+        """The shard, per-user and per-(user, CV) logs a new record belongs to"""
+        user_log = self.activity_by_user.get(user_id)
+        if user_log is None:
+            user_log = self.activity_by_user[user_id] = _ActivityLog()
+        
+        cv_logs = self.activity_by_cv.setdefault(user_id, {})
+        cv_log = cv_logs.get(cv_id)
+        if cv_log is None:
+            cv_log = cv_logs[cv_id] = _ActivityLog()
+        
+        return self.activity, user_log, cv_log
+    
+    def activity_log(self, user_id: str, cv_id: str = None) -> _ActivityLog:
+        """The indexed activity for a user, optionally narrowed to one CV"""
+        if cv_id:
+            log = self.activity_by_cv.get(user_id, {}).get(cv_id)
+        else:
+            log = self.activity_by_user.get(user_id)
+        return log if log is not None else _ActivityLog()
+    
+    def metric_cv_ids(self, user_id: str, cv_id: str = None) -> List[str]:
+        """CVs whose metrics belong in the user's view: those the user has events for"""
+        cv_logs = self.activity_by_cv.get(user_id, {})
+        if cv_id:
+            log = cv_logs.get(cv_id)
+            return [cv_id] if log is not None and log.events else []
+        return [cv for cv, log in cv_logs.items() if log.events]
+    
+    def cached_dashboard(self, cache_key: Tuple, now: datetime) -> Optional[bytes]:
+        """The pickled dashboard for cache_key, dropping entries from earlier buckets"""
+        bucket = int(now.timestamp()) // DASHBOARD_CACHE_SECONDS
+        with self.lock:
+            if bucket != self.dashboard_cache_bucket:
+                self.dashboard_cache.clear()
+                self.dashboard_cache_bucket = bucket
+            return self.dashboard_cache.get(cache_key)
+    
+    def cache_dashboard(self, cache_key: Tuple, dashboard_data: Dict[str, Any]):
+        """Store a pickled copy of a freshly built dashboard"""
+        blob = pickle.dumps(dashboard_data, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            if len(self.dashboard_cache) >= _DASHBOARD_CACHE_SIZE:
+                del self.dashboard_cache[next(iter(self.dashboard_cache))]
+            self.dashboard_cache[cache_key] = blob
+    
+    def prune_expired(self):
+        """Evict raw events and applications that fell out of the retention window
+        
+        Every log is time-ordered, so the expired entries are a prefix found by
+        binary search. Only the indexes of users with expired records are touched.
+        Metrics and trend summaries derived from them are kept.
+        """
+        store = self.activity
+        oldest_ns = store.oldest_ns()
+        now = datetime.now()
+        if oldest_ns is None or oldest_ns >= _to_ns(now - self.retention - _RETENTION_SLACK):
+            return
+        
+        cutoff_ns = _to_ns(now - self.retention)
+        expired = store.events[:bisect_left(store.event_timestamps, cutoff_ns)]
+        expired += store.applications[:bisect_left(store.application_dates, cutoff_ns)]
+        store.prune(cutoff_ns)
+        
+        for user_id, cv_id in {(record.user_id, record.cv_id) for record in expired}:
+            self.user_versions[user_id] += 1
+            
+            user_log = self.activity_by_user.get(user_id)
+            if user_log is not None:
+                user_log.prune(cutoff_ns)
+                if user_log.is_empty():
+                    del self.activity_by_user[user_id]
+            
+            cv_logs = self.activity_by_cv.get(user_id, {})
+            cv_log = cv_logs.get(cv_id)
+            if cv_log is not None:
+                cv_log.prune(cutoff_ns)
+                if cv_log.is_empty():
+                    del cv_logs[cv_id]
+                    if not cv_logs:
+                        del self.activity_by_cv[user_id]
+
 class AnalyticsService:
     """
     Main analytics service for CV performance tracking
+    
+    Per-user activity is split into shards by user id, each with its own lock, so
+    concurrent requests for different users rarely touch the same structures.
+    Metrics are keyed by CV, which users may share, so they stay service-wide
+    behind a separate lock; only score events produce them.
     """
     
-    def __init__(self):
-        self.events: List[AnalyticsEvent] = []
-        self.applications: List[ApplicationTracking] = []
+    def __init__(self, retention_days: int = EVENT_RETENTION_DAYS,
+                 shard_count: int = ANALYTICS_SHARD_COUNT):
+        self.retention = timedelta(days=retention_days)
+        self.shards = [_AnalyticsShard(self.retention) for _ in range(shard_count)]
+        
+        self._metrics_lock = threading.Lock()
         self.metrics: List[PerformanceMetric] = []
+        self._metrics_by_cv: Dict[str, List[PerformanceMetric]] = defaultdict(list)
+        self._cv_versions: Dict[str, int] = defaultdict(int)
         self.benchmarks: List[CompetitorBenchmark] = []
         
         self.metrics_calculator = MetricsCalculator()
         self.trend_analyzer = TrendAnalyzer()
         self.insight_generator = InsightGenerator()
     
+    def _shard(self, user_id: str) -> _AnalyticsShard:
+        return self.shards[hash(user_id) % len(self.shards)]
+    
     async def track_event(self, event: AnalyticsEvent) -> bool:
         """Track an analytics event"""
         try:
-            self.events.append(event)
+            shard = self._shard(event.user_id)
+            with shard.lock:
+                shard.add_event(event)
+                shard.prune_expired()
             
             # Generate metrics from event if applicable
-            await self._generate_metrics_from_event(event)
-            
+            metric = self._metric_from_event(event)
+            if metric:
+                with self._metrics_lock:
+                    self.metrics.append(metric)
+                    self._metrics_by_cv[metric.cv_id].append(metric)
+                    self._cv_versions[metric.cv_id] += 1
+                    self.trend_analyzer.record_metric(metric)
             return True
         except Exception as e:
             logger.error(f"Error tracking event: {e}")
@@ -649,7 +1159,9 @@ class AnalyticsService:
     async def track_application(self, application: ApplicationTracking) -> bool:
         """Track a job application"""
         try:
-            self.applications.append(application)
+            shard = self._shard(application.user_id)
+            with shard.lock:
+                shard.add_application(application)
             
             # Track application event
             event = AnalyticsEvent(
@@ -671,29 +1183,75 @@ class AnalyticsService:
             logger.error(f"Error tracking application: {e}")
             return False
     
+    def _metrics_for_cvs(self, cv_ids: List[str]) -> List[PerformanceMetric]:
+        """Metrics for the given CVs, in generation order"""
+        if len(cv_ids) == 1:
+            return self._metrics_by_cv.get(cv_ids[0], [])
+        if not cv_ids:
+            return []
+        
+        # Several CVs: one pass over the store keeps metrics interleaved in generation order
+        wanted = set(cv_ids)
+        return [m for m in self.metrics if m.cv_id in wanted]
+    
     async def get_dashboard_data(self, user_id: str, cv_id: str = None, 
-                               timeframe_days: int = 30) -> Dict[str, Any]:
-        """Get comprehensive dashboard data for a user"""
+                               timeframe_days: int = 30,
+                               now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Get comprehensive dashboard data for a user
         
-        # Filter data for user
-        user_events = [e for e in self.events if e.user_id == user_id]
-        user_applications = [a for a in self.applications if a.user_id == user_id]
-        user_metrics = [m for m in self.metrics if m.cv_id in [e.cv_id for e in user_events]]
+        Without an explicit ``now`` the response is reused for the rest of the
+        current cache bucket, until new activity for the user or their CVs arrives.
+        """
         
-        if cv_id:
-            user_events = [e for e in user_events if e.cv_id == cv_id]
-            user_applications = [a for a in user_applications if a.cv_id == cv_id]
-            user_metrics = [m for m in user_metrics if m.cv_id == cv_id]
+        # Look up the user's indexed slice instead of scanning the whole store
+        shard = self._shard(user_id)
+        activity = shard.activity_log(user_id, cv_id)
+        metric_cv_ids = shard.metric_cv_ids(user_id, cv_id)
+        
+        if now is not None:
+            return self._build_dashboard_data(shard, user_id, activity, metric_cv_ids, timeframe_days, now)
+        
+        now = datetime.now()
+        cv_versions = tuple(self._cv_versions.get(cv, 0) for cv in metric_cv_ids)
+        cache_key = (user_id, cv_id, timeframe_days, shard.user_versions.get(user_id, 0), cv_versions)
+        cached = shard.cached_dashboard(cache_key, now)
+        if cached is not None:
+            # Stored pickled so callers can't mutate the cached copy
+            return pickle.loads(cached)
+        
+        dashboard_data = self._build_dashboard_data(shard, user_id, activity, metric_cv_ids, timeframe_days, now)
+        shard.cache_dashboard(cache_key, dashboard_data)
+        return dashboard_data
+    
+    def _build_dashboard_data(self, shard: _AnalyticsShard, user_id: str, activity: _ActivityLog,
+                              metric_cv_ids: List[str], timeframe_days: int,
+                              now: datetime) -> Dict[str, Any]:
+        """Compute the dashboard from a user's activity slice at a fixed reference time"""
+        
+        user_events = activity.events
+        user_applications = activity.applications
+        user_metrics = self._metrics_for_cvs(metric_cv_ids)
+        
+        # Nothing recorded yet (e.g. a new user): skip the metric and trend work
+        if activity.is_empty() and not user_metrics:
+            return self._empty_dashboard_data(user_id, timeframe_days, now)
         
         # Calculate current metrics
         current_metrics = {}
         for metric_type in MetricType:
             current_metrics[metric_type.value] = self.metrics_calculator.calculate_metric(
-                metric_type, user_events, user_applications, timeframe_days
+                metric_type, user_events, user_applications, timeframe_days,
+                event_timestamps=activity.event_timestamps,
+                application_dates=activity.application_dates,
+                now=now
             )
         
-        # Analyze trends
-        trends = self.trend_analyzer.analyze_performance_trends(user_metrics, timeframe_days)
+        # Analyze trends, reading the running summaries when a single CV is in scope
+        trends = None
+        if len(metric_cv_ids) == 1:
+            trends = self.trend_analyzer.get_cached_trends(metric_cv_ids[0])
+        if trends is None:
+            trends = self.trend_analyzer.analyze_performance_trends(user_metrics, timeframe_days)
         
         # Find peak periods
         peak_periods = self.trend_analyzer.identify_peak_performance_periods(user_metrics)
@@ -704,11 +1262,12 @@ class AnalyticsService:
         )
         
         # Application funnel analysis
-        funnel_data = self._analyze_application_funnel(user_applications)
+        funnel_data = self._analyze_application_funnel(activity.application_columns()[1])
         
         # Recent activity
-        recent_events = sorted([e for e in user_events if e.timestamp >= datetime.now() - timedelta(days=7)], 
-                              key=lambda x: x.timestamp, reverse=True)[:10]
+        # Newest first, read from the log's recent-events deque
+        recent_cutoff_ns = _to_ns(now - timedelta(days=7))
+        recent_events = [e for e in reversed(activity.recent_events) if e.timestamp_ns >= recent_cutoff_ns]
         
         return {
             "summary": {
@@ -722,31 +1281,52 @@ class AnalyticsService:
             },
             "trends": trends,
             "peak_periods": peak_periods,
-            "insights": [asdict(insight) for insight in insights],
+            "insights": [insight.to_dict() for insight in insights],
             "application_funnel": funnel_data,
-            "recent_activity": [self._event_to_dict(e) for e in recent_events],
-            "timeframe": {
-                "days": timeframe_days,
-                "start_date": (datetime.now() - timedelta(days=timeframe_days)).isoformat(),
-                "end_date": datetime.now().isoformat()
-            }
+            "recent_activity": [e.to_dict() for e in recent_events],
+            "timeframe": _timeframe_window(timeframe_days, now)
+        }
+    
+    def _empty_dashboard_data(self, user_id: str, timeframe_days: int,
+                              now: datetime) -> Dict[str, Any]:
+        """Zero-filled dashboard for users without any recorded activity"""
+        insights = self.insight_generator.generate_insights(user_id, [], [], [], self.benchmarks)
+        
+        return {
+            "summary": {
+                "total_views": 0,
+                "total_downloads": 0,
+                "total_applications": 0,
+                "interview_rate": 0.0,
+                "response_rate": 0.0,
+                "ats_score": 0.0,
+                "optimization_score": 0.0
+            },
+            "trends": {},
+            "peak_periods": [],
+            "insights": [insight.to_dict() for insight in insights],
+            "application_funnel": self._analyze_application_funnel(np.empty(0, dtype=np.int8)),
+            "recent_activity": [],
+            "timeframe": _timeframe_window(timeframe_days, now)
         }
     
     async def get_performance_report(self, user_id: str, cv_id: str = None) -> Dict[str, Any]:
         """Generate a comprehensive performance report"""
         
-        dashboard_data = await self.get_dashboard_data(user_id, cv_id, 90)  # 90-day report
+        now = datetime.now()
         
-        # Additional analysis for report
-        user_events = [e for e in self.events if e.user_id == user_id]
-        user_applications = [a for a in self.applications if a.user_id == user_id]
+        # One index lookup shared by the dashboard part and the report-only analyses
+        shard = self._shard(user_id)
+        activity = shard.activity_log(user_id, cv_id)
+        metric_cv_ids = shard.metric_cv_ids(user_id, cv_id)
+        dashboard_data = self._build_dashboard_data(shard, user_id, activity, metric_cv_ids, 90, now)  # 90-day report
         
-        if cv_id:
-            user_events = [e for e in user_events if e.cv_id == cv_id]
-            user_applications = [a for a in user_applications if a.cv_id == cv_id]
+        # Additional analysis for report
+        user_events = activity.events
+        user_applications = activity.applications
         
         # Month-over-month comparison
-        mom_comparison = self._calculate_month_over_month_change(user_events, user_applications)
+        mom_comparison = self._calculate_month_over_month_change(activity, now=now)
         
         # Success factors analysis
         success_factors = self._analyze_success_factors(user_events, user_applications)
@@ -759,11 +1339,12 @@ class AnalyticsService:
             "month_over_month": mom_comparison,
             "success_factors": success_factors,
             "recommendations": recommendations,
-            "report_generated": datetime.now().isoformat()
+            "report_generated": dashboard_data["timeframe"]["end_date"]  # same reference time
         }
     
-    async def _generate_metrics_from_event(self, event: AnalyticsEvent):
-        """Generate metrics from incoming events"""
+    @staticmethod
+    def _metric_from_event(event: AnalyticsEvent) -> Optional[PerformanceMetric]:
+        """The metric an incoming event produces, if any"""
         
         metric_value = None
         
@@ -783,13 +1364,12 @@ class AnalyticsService:
                 cv_id=event.cv_id
             )
         
-        if metric_value:
-            self.metrics.append(metric_value)
+        return metric_value
     
-    def _analyze_application_funnel(self, applications: List[ApplicationTracking]) -> Dict[str, Any]:
-        """Analyze application funnel conversion rates"""
+    def _analyze_application_funnel(self, stages: np.ndarray) -> Dict[str, Any]:
+        """Analyze application funnel conversion rates from an application stage column"""
         
-        if not applications:
+        if len(stages) == 0:
             return {
                 "applied": 0,
                 "viewed": 0,
@@ -799,12 +1379,14 @@ class AnalyticsService:
                 "conversion_rates": {}
             }
         
+        viewed, scheduled, completed, offered = _funnel_counts(stages)
+        
         status_counts = {
-            "applied": len(applications),
-            "viewed": len([a for a in applications if a.status in ["viewed", "interview_scheduled", "interview_completed", "offered"]]),
-            "interview_scheduled": len([a for a in applications if a.status in ["interview_scheduled", "interview_completed", "offered"]]),
-            "interview_completed": len([a for a in applications if a.status in ["interview_completed", "offered"]]),
-            "offered": len([a for a in applications if a.status == "offered"])
+            "applied": len(stages),
+            "viewed": viewed,
+            "interview_scheduled": scheduled,
+            "interview_completed": completed,
+            "offered": offered
         }
         
         # Calculate conversion rates
@@ -825,22 +1407,36 @@ class AnalyticsService:
             "conversion_rates": conversion_rates
         }
     
-    def _calculate_month_over_month_change(self, events: List[AnalyticsEvent], 
-                                         applications: List[ApplicationTracking]) -> Dict[str, Any]:
+    def _calculate_month_over_month_change(self, activity: _ActivityLog,
+                                          now: Optional[datetime] = None) -> Dict[str, Any]:
         """Calculate month-over-month performance changes"""
         
-        now = datetime.now()
+        if activity.is_empty():
+            return {key: {"current": 0, "previous": 0, "change_percentage": 0}
+                    for key in ("views", "downloads", "applications", "interviews")}
+        
+        if now is None:
+            now = datetime.now()
         current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         previous_month_start = (current_month_start - timedelta(days=32)).replace(day=1)
         previous_month_end = current_month_start - timedelta(days=1)
         
-        # Current month data
-        current_events = [e for e in events if e.timestamp >= current_month_start]
-        current_applications = [a for a in applications if a.application_date >= current_month_start]
+        previous_start = _to_ns(previous_month_start)
+        previous_end = _to_ns(previous_month_end)
+        current_start = _to_ns(current_month_start)
+        
+        def count_events(event_type, start_ns, end_ns=None):
+            # Two bisects on the per-type timestamps; no scan over the events
+            timestamps = activity.timestamps_by_type.get(event_type, [])
+            end = len(timestamps) if end_ns is None else bisect_right(timestamps, end_ns)
+            return end - bisect_left(timestamps, start_ns)
         
-        # Previous month data
-        previous_events = [e for e in events if previous_month_start <= e.timestamp <= previous_month_end]
-        previous_applications = [a for a in applications if previous_month_start <= a.application_date <= previous_month_end]
+        # Application windows as index ranges into the time-ordered stage column
+        application_dates = activity.application_dates
+        stages = activity.application_columns()[1]
+        previous_stages = stages[bisect_left(application_dates, previous_start):
+                                 bisect_right(application_dates, previous_end)]
+        current_stages = stages[bisect_left(application_dates, current_start):]
         
         def calculate_change(current, previous):
             if previous == 0:
@@ -848,17 +1444,17 @@ class AnalyticsService:
             return round(((current - previous) / previous) * 100, 1)
         
         current_metrics = {
-            "views": len([e for e in current_events if e.event_type == EventType.CV_VIEWED]),
-            "downloads": len([e for e in current_events if e.event_type == EventType.CV_DOWNLOADED]),
-            "applications": len(current_applications),
-            "interviews": len([a for a in current_applications if a.status in ["interview_scheduled", "interview_completed", "offered"]])
+            "views": count_events(EventType.CV_VIEWED, current_start),
+            "downloads": count_events(EventType.CV_DOWNLOADED, current_start),
+            "applications": len(current_stages),
+            "interviews": _funnel_counts(current_stages)[1]
         }
         
         previous_metrics = {
-            "views": len([e for e in previous_events if e.event_type == EventType.CV_VIEWED]),
-            "downloads": len([e for e in previous_events if e.event_type == EventType.CV_DOWNLOADED]),
-            "applications": len(previous_applications),
-            "interviews": len([a for a in previous_applications if a.status in ["interview_scheduled", "interview_completed", "offered"]])
+            "views": count_events(EventType.CV_VIEWED, previous_start, previous_end),
+            "downloads": count_events(EventType.CV_DOWNLOADED, previous_start, previous_end),
+            "applications": len(previous_stages),
+            "interviews": _funnel_counts(previous_stages)[1]
         }
         
         changes = {}
@@ -883,87 +1479,34 @@ class AnalyticsService:
         }
         
         # Analyze successful applications
-        successful_apps = [a for a in applications if a.status in ["interview_scheduled", "interview_completed", "offered"]]
+        successful_apps = [a for a in applications if a.stage >= ApplicationStage.INTERVIEW_SCHEDULED]
         
         if successful_apps:
             # Best days of week for applications
-            successful_days = [a.application_date.strftime("%A") for a in successful_apps]
-            if successful_days:
-                day_counts = {day: successful_days.count(day) for day in set(successful_days)}
-                success_factors["best_application_days"] = sorted(day_counts.items(), key=lambda x: x[1], reverse=True)[:3]
-        
-        # Analyze template effectiveness
-        template_events = [e for e in events if e.event_type == EventType.TEMPLATE_CHANGED]
-        for template_event in template_events:
-            # This would analyze performance after template changes
-            template_name = template_event.metadata.get("new_template")
-            if template_name:
-                success_factors["effective_templates"].append(template_name)
+            day_counts = Counter(a.application_weekday for a in successful_apps)
+            success_factors["best_application_days"] = [
+                (_WEEKDAY_NAMES[day], count) for day, count in day_counts.most_common(3)
+            ]
+        
+        # Analyze template effectiveness: the most frequently adopted templates
+        template_counts = Counter(
+            e.metadata.get("new_template") for e in events
+            if e.event_type == EventType.TEMPLATE_CHANGED and e.metadata.get("new_template")
+        )
+        success_factors["effective_templates"] = [name for name, _ in template_counts.most_common(5)]
         
         return success_factors
     
     def _generate_performance_recommendations(self, dashboard_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate performance improvement recommendations"""
         
-        recommendations = []
         summary = dashboard_data.get("summary", {})
         
-        # ATS score recommendations
-        ats_score = summary.get("ats_score", 0)
-        if ats_score < 70:
-            recommendations.append({
-                "type": "ats_improvement",
-                "priority": "high",
-                "title": "Improve ATS Compatibility",
-                "description": "Your ATS score is below optimal. Focus on keyword optimization and formatting.",
-                "action_items": [
-                    "Add more industry-relevant keywords",
-                    "Use standard section headings",
-                    "Include quantifiable achievements"
-                ]
-            })
-        
-        # Application rate recommendations
-        interview_rate = summary.get("interview_rate", 0)
-        if interview_rate < 10:
-            recommendations.append({
-                "type": "interview_improvement",
-                "priority": "high",
-                "title": "Increase Interview Rate",
-                "description": "Your interview rate is below average. Consider CV optimization and targeting.",
-                "action_items": [
-                    "Tailor CV to each job posting",
-                    "Improve professional summary",
-                    "Add more relevant achievements"
-                ]
-            })
-        
-        # Activity recommendations
-        total_applications = summary.get("total_applications", 0)
-        if total_applications < 10:
-            recommendations.append({
-                "type": "activity_increase",
-                "priority": "medium",
-                "title": "Increase Application Activity",
-                "description": "More applications can lead to better insights and opportunities.",
-                "action_items": [
-                    "Set a target of 5-10 applications per week",
-                    "Use job boards and networking",
-                    "Track application outcomes"
-                ]
-            })
-        
-        return recommendations
-    
-    def _event_to_dict(self, event: AnalyticsEvent) -> Dict[str, Any]:
-        """Convert AnalyticsEvent to dictionary"""
-        return {
-            "event_id": event.event_id,
-            "event_type": event.event_type.value,
-            "timestamp": event.timestamp.isoformat(),
-            "metadata": event.metadata,
-            "source": event.source
-        }
+        return [
+            {**recommendation, "action_items": list(recommendation["action_items"])}
+            for summary_key, threshold, recommendation in _RECOMMENDATION_RULES
+            if summary.get(summary_key, 0) < threshold
+        ]
 
 # Global service instance
 analytics_service = AnalyticsService()
\ No newline at end of file
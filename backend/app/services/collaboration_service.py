@@ -5,16 +5,58 @@ Free and open-source collaborative CV editing with WebSocket support
 
 import json
 import asyncio
+import heapq
 import uuid
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass, asdict
-from datetime import datetime
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass, asdict, field, is_dataclass
+from datetime import datetime, timedelta
 from enum import Enum
 import logging
 
+from app.core.compat import DATACLASS_SLOTS
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
-class ChangeType(Enum):
+# Most recent changes kept per session; older ones fall off the front
+SESSION_CHANGE_HISTORY = 1000
+
+# Changes closer together than this are treated as concurrent edits
+CONCURRENT_CHANGE_WINDOW = timedelta(seconds=5)
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode session records for WebSocket messages the way orjson does natively"""
+    if is_dataclass(obj):
+        return asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _encode_message(message: Dict[str, Any]) -> str:
+    """Encode a WebSocket message; non-str dict keys are stringified as json does"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(message, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # orjson rejects a few values json accepts, such as integers beyond 64 bits
+            pass
+    return json.dumps(message, default=_json_default)
+
+
+# str-valued enums: hashing and equality run on the str value in C, and they
+# serialize as their values
+class ChangeType(str, Enum):
     TEXT_EDIT = "text_edit"
     SECTION_ADD = "section_add"
     SECTION_DELETE = "section_delete"
@@ -23,13 +65,17 @@ class ChangeType(Enum):
     COMMENT_ADD = "comment_add"
     COMMENT_RESOLVE = "comment_resolve"
 
-class UserRole(Enum):
+class UserRole(str, Enum):
     OWNER = "owner"
     EDITOR = "editor"
     COMMENTER = "commenter"
     VIEWER = "viewer"
 
-@dataclass
+# Roles allowed to edit the CV, and to comment on it
+_CAN_EDIT = frozenset({UserRole.OWNER, UserRole.EDITOR})
+_CAN_COMMENT = frozenset({UserRole.OWNER, UserRole.EDITOR, UserRole.COMMENTER})
+
+@dataclass(**DATACLASS_SLOTS)
 class CollaborationUser:
     user_id: str
     name: str
@@ -39,7 +85,7 @@ class CollaborationUser:
     is_online: bool = False
     last_seen: datetime = None
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CVChange:
     change_id: str
     user_id: str
@@ -50,7 +96,7 @@ class CVChange:
     new_value: Any
     metadata: Dict[str, Any] = None
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Comment:
     comment_id: str
     user_id: str
@@ -61,18 +107,20 @@ class Comment:
     is_resolved: bool = False
     replies: List['Comment'] = None
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class CollaborationSession:
     session_id: str
     cv_id: str
     owner_id: str
     participants: Dict[str, CollaborationUser]
-    changes: List[CVChange]
+    changes: Deque[CVChange]
     comments: List[Comment]
     current_version: int
     created_at: datetime
     last_modified: datetime
     settings: Dict[str, Any]
+    comments_by_id: Dict[str, Comment] = field(default_factory=dict)
+    unresolved_comments: Dict[str, Comment] = field(default_factory=dict)  # comment_id -> comment, in posting order
 
 class OperationalTransform:
     """
@@ -104,8 +152,11 @@ class OperationalTransform:
     @staticmethod
     def _paths_conflict(path1: List[str], path2: List[str]) -> bool:
         """Check if two paths conflict (one is ancestor of the other)"""
-        min_len = min(len(path1), len(path2))
-        return path1[:min_len] == path2[:min_len]
+        # Compare the shared prefix in place instead of slicing copies of both paths
+        for part1, part2 in zip(path1, path2):
+            if part1 != part2:
+                return False
+        return True
     
     @staticmethod
     def _transform_text_edits(change1: CVChange, change2: CVChange) -> tuple[CVChange, CVChange]:
@@ -150,13 +201,15 @@ class CollaborationManager:
     
     def __init__(self):
         self.active_sessions: Dict[str, CollaborationSession] = {}
+        self.cv_to_session: Dict[str, str] = {}  # cv_id -> session_id of its first session
         self.user_sessions: Dict[str, Set[str]] = {}  # user_id -> set of session_ids
-        self.websocket_connections: Dict[str, List] = {}  # session_id -> list of websocket connections
+        self.websocket_connections: Dict[str, Set] = {}  # session_id -> set of websocket connections
     
     async def create_session(self, cv_id: str, owner_id: str, owner_name: str, 
                            owner_email: str) -> CollaborationSession:
         """Create a new collaboration session"""
         session_id = str(uuid.uuid4())
+        now = datetime.now()
         
         owner = CollaborationUser(
             user_id=owner_id,
@@ -164,7 +217,7 @@ class CollaborationManager:
             email=owner_email,
             role=UserRole.OWNER,
             is_online=True,
-            last_seen=datetime.now()
+            last_seen=now
         )
         
         session = CollaborationSession(
@@ -172,11 +225,11 @@ class CollaborationManager:
             cv_id=cv_id,
             owner_id=owner_id,
             participants={owner_id: owner},
-            changes=[],
+            changes=deque(maxlen=SESSION_CHANGE_HISTORY),
             comments=[],
             current_version=1,
-            created_at=datetime.now(),
-            last_modified=datetime.now(),
+            created_at=now,
+            last_modified=now,
             settings={
                 "allow_comments": True,
                 "allow_suggestions": True,
@@ -186,6 +239,7 @@ class CollaborationManager:
         )
         
         self.active_sessions[session_id] = session
+        self.cv_to_session.setdefault(cv_id, session_id)
         
         if owner_id not in self.user_sessions:
             self.user_sessions[owner_id] = set()
@@ -202,7 +256,7 @@ class CollaborationManager:
         session = self.active_sessions[session_id]
         
         # Check permissions
-        if role in [UserRole.OWNER, UserRole.EDITOR] and user_id != session.owner_id:
+        if role in _CAN_EDIT and user_id != session.owner_id:
             # Only owner can assign editor roles
             role = UserRole.COMMENTER
         
@@ -253,12 +307,12 @@ class CollaborationManager:
         
         # Check permissions
         user = session.participants.get(user_id)
-        if not user or user.role not in [UserRole.OWNER, UserRole.EDITOR]:
+        if not user or user.role not in _CAN_EDIT:
             return False
         
         # Apply operational transformation for concurrent changes
-        for existing_change in reversed(session.changes[-10:]):  # Check last 10 changes
-            if abs((change.timestamp - existing_change.timestamp).total_seconds()) < 5:  # Within 5 seconds
+        for existing_change in islice(reversed(session.changes), 10):  # Check last 10 changes
+            if abs(change.timestamp - existing_change.timestamp) < CONCURRENT_CHANGE_WINDOW:
                 change, existing_change = OperationalTransform.transform_changes(change, existing_change)
         
         # Add change to session
@@ -280,7 +334,7 @@ class CollaborationManager:
         session = self.active_sessions[session_id]
         user = session.participants.get(user_id)
         
-        if not user or user.role == UserRole.VIEWER:
+        if not user or user.role not in _CAN_COMMENT:
             return None
         
         comment = Comment(
@@ -295,6 +349,8 @@ class CollaborationManager:
         )
         
         session.comments.append(comment)
+        session.comments_by_id[comment.comment_id] = comment
+        session.unresolved_comments[comment.comment_id] = comment
         
         # Broadcast comment to all participants
         await self._broadcast_comment(session_id, comment)
@@ -313,15 +369,16 @@ class CollaborationManager:
             return False
         
         # Find and resolve comment
-        for comment in session.comments:
-            if comment.comment_id == comment_id:
-                # Only comment author or owner can resolve
-                if user_id == comment.user_id or user.role == UserRole.OWNER:
-                    comment.is_resolved = True
-                    
-                    # Broadcast resolution
-                    await self._broadcast_comment_resolved(session_id, comment_id)
-                    return True
+        comment = session.comments_by_id.get(comment_id)
+        
+        # Only comment author or owner can resolve
+        if comment and (user_id == comment.user_id or user.role == UserRole.OWNER):
+            comment.is_resolved = True
+            session.unresolved_comments.pop(comment_id, None)
+            
+            # Broadcast resolution
+            await self._broadcast_comment_resolved(session_id, comment_id)
+            return True
         
         return False
     
@@ -340,29 +397,32 @@ class CollaborationManager:
             "cv_id": session.cv_id,
             "current_version": session.current_version,
             "participants": {uid: asdict(user) for uid, user in session.participants.items()},
-            "recent_changes": [asdict(change) for change in session.changes[-20:]],  # Last 20 changes
-            "active_comments": [asdict(comment) for comment in session.comments if not comment.is_resolved],
+            "recent_changes": [asdict(change) for change in reversed(list(islice(reversed(session.changes), 20)))],  # Last 20 changes
+            "active_comments": [asdict(comment) for comment in session.unresolved_comments.values()],
             "user_role": session.participants[user_id].role.value,
             "settings": session.settings
         }
     
     async def _broadcast_change(self, session_id: str, change: CVChange):
         """Broadcast a change to all session participants"""
-        if session_id not in self.websocket_connections:
+        if not self.websocket_connections.get(session_id):
             return
         
         message = {
             "type": "change",
-            "data": asdict(change)
+            "data": change
         }
         
         await self._broadcast_message(session_id, message)
     
     async def _broadcast_comment(self, session_id: str, comment: Comment):
         """Broadcast a new comment to all session participants"""
+        if not self.websocket_connections.get(session_id):
+            return
+        
         message = {
             "type": "comment",
-            "data": asdict(comment)
+            "data": comment
         }
         
         await self._broadcast_message(session_id, message)
@@ -378,9 +438,12 @@ class CollaborationManager:
     
     async def _broadcast_user_joined(self, session_id: str, user: CollaborationUser):
         """Broadcast user join event"""
+        if not self.websocket_connections.get(session_id):
+            return
+        
         message = {
             "type": "user_joined",
-            "data": asdict(user)
+            "data": user
         }
         
         await self._broadcast_message(session_id, message)
@@ -396,38 +459,42 @@ class CollaborationManager:
     
     async def _broadcast_message(self, session_id: str, message: Dict[str, Any]):
         """Broadcast a message to all WebSocket connections in a session"""
-        if session_id not in self.websocket_connections:
+        if not self.websocket_connections.get(session_id):
             return
         
-        message_json = json.dumps(message, default=str)
-        
-        # Remove dead connections
-        active_connections = []
+        # Records are passed as dataclasses; orjson encodes them, their enums and
+        # datetimes in C, and the json fallback produces the same shape. The state
+        # change being announced has already happened, so a message that cannot be
+        # encoded is logged and dropped rather than failing the caller.
+        try:
+            message_json = _encode_message(message)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Could not encode {message.get('type')} message for session {session_id}: {e}")
+            return
         
-        for connection in self.websocket_connections[session_id]:
-            try:
-                await connection.send_text(message_json)
-                active_connections.append(connection)
-            except:
-                # Connection is dead, remove it
-                pass
+        # Send to every connection concurrently so one slow client doesn't hold up the rest
+        connections = list(self.websocket_connections[session_id])
+        results = await asyncio.gather(
+            *(connection.send_text(message_json) for connection in connections),
+            return_exceptions=True
+        )
         
-        self.websocket_connections[session_id] = active_connections
+        # Remove dead connections; any that joined while the sends were in flight stay
+        dead_connections = [
+            connection for connection, result in zip(connections, results)
+            if isinstance(result, BaseException)
+        ]
+        if dead_connections and session_id in self.websocket_connections:
+            self.websocket_connections[session_id].difference_update(dead_connections)
     
     def add_websocket_connection(self, session_id: str, websocket):
         """Add a WebSocket connection to a session"""
-        if session_id not in self.websocket_connections:
-            self.websocket_connections[session_id] = []
-        
-        self.websocket_connections[session_id].append(websocket)
+        self.websocket_connections.setdefault(session_id, set()).add(websocket)
     
     def remove_websocket_connection(self, session_id: str, websocket):
         """Remove a WebSocket connection from a session"""
         if session_id in self.websocket_connections:
-            try:
-                self.websocket_connections[session_id].remove(websocket)
-            except ValueError:
-                pass
+            self.websocket_connections[session_id].discard(websocket)
 
 class ShareService:
     """
@@ -437,6 +504,7 @@ class ShareService:
     def __init__(self, collaboration_manager: CollaborationManager):
         self.collaboration_manager = collaboration_manager
         self.share_links: Dict[str, Dict[str, Any]] = {}  # share_token -> share_info
+        self._expiry_heap: List[Tuple[datetime, str]] = []  # (expires_at, share_token), soonest first
     
     def create_share_link(self, cv_id: str, owner_id: str, permissions: Dict[str, Any]) -> str:
         """Create a shareable link for a CV"""
@@ -454,18 +522,23 @@ class ShareService:
         }
         
         self.share_links[share_token] = share_info
+        if isinstance(share_info["expires_at"], datetime):
+            heapq.heappush(self._expiry_heap, (share_info["expires_at"], share_token))
         
         return f"/shared/{share_token}"
     
     def validate_share_link(self, share_token: str, user_id: str = None) -> Optional[Dict[str, Any]]:
         """Validate a share link and return access info"""
+        now = datetime.now()
+        self._purge_expired_links(now)
+        
         if share_token not in self.share_links:
             return None
         
         share_info = self.share_links[share_token]
         
         # Check expiration
-        if share_info["expires_at"] and datetime.now() > share_info["expires_at"]:
+        if share_info["expires_at"] and now > share_info["expires_at"]:
             return None
         
         # Check access count
@@ -482,6 +555,13 @@ class ShareService:
         
         return share_info
     
+    def _purge_expired_links(self, now: datetime):
+        """Drop links whose expiry has passed, soonest-expiring first"""
+        expiry_heap = self._expiry_heap
+        while expiry_heap and expiry_heap[0][0] < now:
+            _, share_token = heapq.heappop(expiry_heap)
+            self.share_links.pop(share_token, None)
+    
     async def access_shared_cv(self, share_token: str, user_id: str = None, 
                               user_name: str = "Anonymous") -> Optional[str]:
         """Access a shared CV and potentially join collaboration session"""
@@ -496,11 +576,7 @@ class ShareService:
         # If collaboration is enabled, create/join session
         if permissions.get("allow_collaboration", False):
             # Find or create collaboration session
-            session_id = None
-            for sid, session in self.collaboration_manager.active_sessions.items():
-                if session.cv_id == cv_id:
-                    session_id = sid
-                    break
+            session_id = self.collaboration_manager.cv_to_session.get(cv_id)
             
             if not session_id:
                 # Create new session
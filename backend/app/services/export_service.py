@@ -4,34 +4,34 @@ Free and open-source CV export to PDF, DOCX, TXT, and HTML formats
 """
 
 import asyncio
+import copy
+import hashlib
+import importlib.util
 import io
 import json
 import logging
-from typing import Dict, List, Any, Optional, Union, BinaryIO
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Union, BinaryIO
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 import tempfile
+import time
 import os
 
-# For PDF generation
-try:
-    from weasyprint import HTML, CSS
-    from weasyprint.text.fonts import FontConfiguration
-    HAS_WEASYPRINT = True
-except ImportError:
-    HAS_WEASYPRINT = False
+# For PDF generation; imported on first use by _load_weasyprint, since WeasyPrint
+# pulls in cairo/pango bindings that TXT, HTML and JSON exports never need
+HAS_WEASYPRINT = importlib.util.find_spec("weasyprint") is not None
+HTML = CSS = FontConfiguration = None
 
-# For DOCX generation
-try:
-    from docx import Document
-    from docx.shared import Inches, Pt
-    from docx.enum.style import WD_STYLE_TYPE
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.oxml.shared import OxmlElement, qn
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
+# For DOCX generation; imported on first use by _load_docx
+HAS_DOCX = importlib.util.find_spec("docx") is not None
+Document = Inches = Pt = WD_STYLE_TYPE = WD_ALIGN_PARAGRAPH = OxmlElement = qn = None
 
 # For HTML templating
 try:
@@ -40,8 +40,314 @@ try:
 except ImportError:
     HAS_JINJA2 = False
 
+# For fast JSON export
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from app.core.config import settings as app_settings
+from app.core.compat import DATACLASS_SLOTS
+
 logger = logging.getLogger(__name__)
 
+def _load_weasyprint() -> bool:
+    """Import WeasyPrint on first use; False if it is not available"""
+    global HTML, CSS, FontConfiguration, HAS_WEASYPRINT
+    
+    if HTML is None and HAS_WEASYPRINT:
+        try:
+            from weasyprint import HTML, CSS
+            from weasyprint.text.fonts import FontConfiguration
+        except (ImportError, OSError) as e:
+            # OSError: the package is installed but its native libraries are missing
+            logger.error(f"WeasyPrint could not be loaded: {e}")
+            HAS_WEASYPRINT = False
+    
+    return HAS_WEASYPRINT
+
+def _load_docx() -> bool:
+    """Import python-docx on first use; False if it is not available"""
+    global Document, Inches, Pt, WD_STYLE_TYPE, WD_ALIGN_PARAGRAPH, OxmlElement, qn
+    global HAS_DOCX, _RUN_PROPERTIES
+    
+    if Document is None and HAS_DOCX:
+        try:
+            from docx import Document
+            from docx.shared import Inches, Pt
+            from docx.enum.style import WD_STYLE_TYPE
+            from docx.enum.text import WD_ALIGN_PARAGRAPH
+            from docx.oxml.shared import OxmlElement, qn
+        except ImportError as e:
+            logger.error(f"python-docx could not be loaded: {e}")
+            HAS_DOCX = False
+            return False
+        
+        _RUN_PROPERTIES = {
+            (True, False): _run_properties('w:b'),
+            (False, True): _run_properties('w:i'),
+            (True, True): _run_properties('w:b', 'w:i'),
+        }
+    
+    return HAS_DOCX
+
+# Directory holding the export HTML templates
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '..', 'templates')
+
+def _create_jinja_env() -> Optional["Environment"]:
+    """Create the shared template environment, or None if unavailable"""
+    if not HAS_JINJA2 or not os.path.exists(TEMPLATE_DIR):
+        return None
+    
+    from app.core.jinja_cache import create_bytecode_cache
+    
+    # Compiled templates are kept on disk so fresh workers skip the Jinja compile step
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        bytecode_cache=create_bytecode_cache(),
+        auto_reload=False,
+        cache_size=400
+    )
+
+# Shared across requests so each template is compiled once per process
+_JINJA_ENV = _create_jinja_env()
+
+@lru_cache(maxsize=None)
+def _get_template(name: str) -> "Template":
+    """Resolve a template once per process; missing names raise and are not cached"""
+    return _JINJA_ENV.get_template(name)
+
+# Linked stylesheets (e.g. web fonts) that WeasyPrint would fetch and parse on every render
+_STYLESHEET_LINK_PATTERN = re.compile(r'<link[^>]+rel=["\']stylesheet["\'][^>]*>', re.IGNORECASE)
+
+# Closing head tag, where standalone HTML exports get their extra styles
+_HEAD_END_PATTERN = re.compile(r'</head\s*>', re.IGNORECASE)
+
+# Export-specific styles added to standalone HTML exports
+_EXPORT_CSS = """
+        <style>
+        /* Export optimizations */
+        * {
+            -webkit-print-color-adjust: exact;
+            print-color-adjust: exact;
+        }
+        
+        @media print {
+            body {
+                margin: 0;
+                padding: 0;
+            }
+            
+            .template-container {
+                box-shadow: none;
+                margin: 0;
+            }
+        }
+        
+        .export-note {
+            display: none;
+        }
+        </style>
+        """
+
+# Print stylesheet for PDF exports, filled in once per distinct settings combination
+_PDF_CSS_TEMPLATE = """
+        @page {{
+            size: {page_size};
+            margin-top: {top}mm;
+            margin-bottom: {bottom}mm;
+            margin-left: {left}mm;
+            margin-right: {right}mm;
+        }}
+        
+        body {{
+            font-family: '{font_family}', Arial, sans-serif;
+            font-size: {font_size}pt;
+            line-height: {line_spacing};
+            color: #000;
+            margin: 0;
+            padding: 0;
+        }}
+        
+        .template-container {{
+            width: 100%;
+            max-width: none;
+            margin: 0;
+            box-shadow: none;
+        }}
+        
+        /* Print-specific styles */
+        * {{
+            print-color-adjust: exact;
+            -webkit-print-color-adjust: exact;
+        }}
+        
+        .no-break {{
+            page-break-inside: avoid;
+        }}
+        
+        .page-break {{
+            page-break-before: always;
+        }}
+        
+        h1, h2, h3 {{
+            page-break-after: avoid;
+        }}
+        
+        /* Ensure colors print correctly */
+        .header {{
+            background: #3182ce !important;
+            color: white !important;
+        }}
+        
+        .skill-item {{
+            background: #3182ce !important;
+            color: white !important;
+        }}
+        {quality_overrides}{watermark_rule}"""
+
+# Larger type for high and print quality PDFs
+_PDF_HIGH_QUALITY_CSS = """
+            body {
+                font-size: 12pt;
+                line-height: 1.3;
+            }
+            
+            .section-title {
+                font-size: 14pt;
+            }
+            
+            .header-name {
+                font-size: 24pt;
+            }
+            """
+
+# Diagonal text watermark repeated on every PDF page
+_PDF_WATERMARK_CSS = """
+            @page {{
+                background-image: url("data:image/svg+xml;charset=utf-8,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 400 200'%3E%3Ctext x='50%25' y='50%25' text-anchor='middle' font-size='40' fill='%23f0f0f0' opacity='0.3' transform='rotate(-45 200 100)'%3E{watermark}%3C/text%3E%3C/svg%3E");
+                background-repeat: repeat;
+                background-position: center;
+            }}
+            """
+
+# Characters replaced in download filenames; also rules out path separators
+_UNSAFE_FILENAME_PATTERN = re.compile(r'[^\w.-]+')
+
+# Document head and header for the fallback HTML, filled with format_map
+_BASIC_HTML_HEAD_TMPL = """
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>{title}</title>
+            <style>
+                body {{
+                    font-family: Arial, sans-serif;
+                    max-width: 800px;
+                    margin: 0 auto;
+                    padding: 20px;
+                    line-height: 1.6;
+                }}
+                .header {{
+                    text-align: center;
+                    margin-bottom: 30px;
+                    padding: 20px;
+                    background: #f8f9fa;
+                }}
+                .section {{
+                    margin-bottom: 25px;
+                }}
+                .section-title {{
+                    color: #333;
+                    border-bottom: 2px solid #333;
+                    padding-bottom: 5px;
+                    margin-bottom: 15px;
+                }}
+                .experience-item {{
+                    margin-bottom: 20px;
+                }}
+                .job-title {{
+                    font-weight: bold;
+                    font-size: 1.1em;
+                }}
+                .company {{
+                    color: #666;
+                    font-style: italic;
+                }}
+                .achievements {{
+                    margin-top: 10px;
+                }}
+                .achievement {{
+                    margin-left: 20px;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>{full_name}</h1>
+                <p>{desired_position}</p>
+                <p>{email} | {phone} | {location}</p>
+            </div>
+        """
+
+_BASIC_HTML_TAIL = """
+        </body>
+        </html>
+        """
+
+# Placeholders understood by the fallback renderer: "{{ key }}" and "{{ key.subkey }}"
+_TEMPLATE_VAR_PATTERN = re.compile(r'\{\{ ([^{}\s]+) \}\}')
+
+# Streamed exports are spooled here; tmpfs keeps them off disk when available
+EXPORT_SPOOL_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Print stylesheets kept per distinct combination of PDF settings
+PDF_CSS_CACHE_SIZE = 64
+
+# Decoded images (watermark SVG, photos) shared by all PDF renders, keyed by URL
+PDF_IMAGE_CACHE_SIZE = 64
+
+# Parsed WeasyPrint documents kept for recently exported HTML (re-exports with new settings)
+PDF_HTML_CACHE_SIZE = 32
+
+# JPEG quality for embedded photos in compressed draft/standard PDFs
+PDF_JPEG_QUALITY = 85
+
+# Pre-styled empty DOCX documents kept per distinct font and margin settings
+DOCX_SKELETON_CACHE_SIZE = 32
+
+class _BoundedCache(dict):
+    """Dict that evicts its oldest entry once it holds max_size items
+    
+    Exports run in worker threads, so inserts and evictions are serialized;
+    otherwise two threads can pick the same oldest key and the second delete fails.
+    """
+    
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+        self._lock = threading.Lock()
+    
+    def __setitem__(self, key, value):
+        with self._lock:
+            if key not in self and len(self) >= self.max_size:
+                self.pop(next(iter(self), None), None)
+            super().__setitem__(key, value)
+
+# Passed to WeasyPrint so images, including the watermark data URI, are decoded once
+_IMAGE_CACHE = _BoundedCache(PDF_IMAGE_CACHE_SIZE)
+
+# Parsed HTML documents, keyed by a digest of the HTML; per process, like the caches above
+_PARSED_HTML: Dict[bytes, "HTML"] = _BoundedCache(PDF_HTML_CACHE_SIZE)
+
+# Long-lived PDF workers, created on the first PDF export
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+_PDF_POOL_UNAVAILABLE = False
+
 class ExportFormat(Enum):
     PDF = "pdf"
     DOCX = "docx"
@@ -69,6 +375,8 @@ class ExportSettings:
     line_spacing: float = 1.15
     compress: bool = True
     watermark: Optional[str] = None
+    strip_external_css: bool = True  # PDF only: drop linked stylesheets, the print CSS is injected
+    streaming: bool = False  # Return file_path to a temporary file instead of file_data
     
     def __post_init__(self):
         if self.margins is None:
@@ -90,46 +398,234 @@ class ExportResult:
         if self.metadata is None:
             self.metadata = {}
 
+@dataclass(**DATACLASS_SLOTS)
+class _ExperienceEntry:
+    job_title: str
+    company: str
+    start_date: str
+    end_date: str  # "Present" for current roles
+    location: Optional[str]
+    achievements: List[str]
+
+@dataclass(**DATACLASS_SLOTS)
+class _EducationEntry:
+    degree: str
+    institution: str
+    details: List[str]  # Date range and grade, when given
+
+@dataclass(**DATACLASS_SLOTS)
+class _ProjectEntry:
+    name: str
+    description: Optional[str]
+    technologies: List[str]
+
+@dataclass(**DATACLASS_SLOTS)
+class _CVView:
+    """CV sections read once into flat records shared by the text-based exporters"""
+    personal: Dict[str, Any]
+    summary: Optional[str]
+    skills: Dict[str, List[str]]
+    experience: List[_ExperienceEntry]
+    education: List[_EducationEntry]
+    projects: List[_ProjectEntry]
+
+def _safe_filename(cv_data: Dict[str, Any], extension: str) -> str:
+    """Download filename built from the CV owner's name"""
+    name = (cv_data.get("personal_details") or {}).get("full_name") or "CV"
+    return f"{_UNSAFE_FILENAME_PATTERN.sub('_', name)}_CV.{extension}"
+
+def _coerce_cv(cv_data: Dict[str, Any]) -> _CVView:
+    """Resolve the defaults of every CV entry in a single pass"""
+    
+    experience = []
+    for exp in cv_data.get("work_experience") or []:
+        experience.append(_ExperienceEntry(
+            job_title=exp.get("job_title", ""),
+            company=exp.get("company", ""),
+            start_date=exp.get("start_date", ""),
+            end_date=exp.get("end_date", "Present") if not exp.get("is_current") else "Present",
+            location=exp.get("location"),
+            achievements=exp.get("achievements") or []
+        ))
+    
+    education = []
+    for edu in cv_data.get("education") or []:
+        details = []
+        start = edu.get("start_date", "")
+        end = edu.get("end_date", "")
+        if start or end:
+            details.append(f"{start} - {end}" if start and end else start or end)
+        
+        if edu.get("grade"):
+            details.append(edu["grade"])
+        
+        education.append(_EducationEntry(
+            degree=edu.get("degree", ""),
+            institution=edu.get("institution", ""),
+            details=details
+        ))
+    
+    projects = [
+        _ProjectEntry(
+            name=project.get("name", ""),
+            description=project.get("description"),
+            technologies=project.get("technologies") or []
+        )
+        for project in cv_data.get("projects") or []
+    ]
+    
+    return _CVView(
+        personal=cv_data.get("personal_details", {}),
+        summary=cv_data.get("professional_summary"),
+        skills=cv_data.get("skills"),
+        experience=experience,
+        education=education,
+        projects=projects
+    )
+
+def _get_html_document(template_html: str) -> "HTML":
+    """Parse HTML once per distinct content; WeasyPrint documents can be rendered repeatedly"""
+    
+    key = hashlib.blake2b(template_html.encode('utf-8'), digest_size=16).digest()
+    html_doc = _PARSED_HTML.get(key)
+    if html_doc is None:
+        html_doc = HTML(string=template_html)
+        _PARSED_HTML[key] = html_doc
+    
+    return html_doc
+
+def _render_pdf(template_html: str, css_content: str,
+                image_options: Dict[str, Any]) -> Tuple[bytes, int]:
+    """Render HTML to PDF bytes and its page count"""
+    
+    _load_weasyprint()
+    html_doc = _get_html_document(template_html)
+    css_doc = PDFExporter._compiled_pdf_css(css_content)
+    
+    # Lay out pages once; the rendered document already knows its page count
+    document = html_doc.render(stylesheets=[css_doc], font_config=PDFExporter.get_font_config(),
+                               cache=_IMAGE_CACHE, **image_options)
+    
+    # Generate PDF; without a target WeasyPrint returns the bytes directly
+    return document.write_pdf(), len(document.pages)
+
+def _prewarm_pdf_worker():
+    """Load WeasyPrint's native libraries and font caches before the first job arrives"""
+    _load_weasyprint()
+    HTML(string="<html><body><p>CV</p></body></html>").render(font_config=PDFExporter.get_font_config())
+
+def _render_pdf_in_pool(template_html: str, css_content: str,
+                        image_options: Dict[str, Any]) -> Tuple[bytes, int]:
+    """Render a PDF in one of the warm worker processes"""
+    global _PDF_POOL, _PDF_POOL_UNAVAILABLE
+    
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None and not _PDF_POOL_UNAVAILABLE:
+            try:
+                # Spawned rather than forked: pango/cairo state is not fork-safe
+                _PDF_POOL = ProcessPoolExecutor(
+                    max_workers=app_settings.PDF_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_prewarm_pdf_worker
+                )
+            except (OSError, NotImplementedError) as e:
+                # Some serverless runtimes lack the semaphores multiprocessing needs
+                logger.warning(f"PDF worker pool unavailable, rendering in-process: {e}")
+                _PDF_POOL_UNAVAILABLE = True
+        pool = _PDF_POOL
+    
+    if pool is None:
+        return _render_pdf(template_html, css_content, image_options)
+    
+    future = pool.submit(_render_pdf, template_html, css_content, image_options)
+    try:
+        return future.result(timeout=app_settings.PDF_TIMEOUT)
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); let the next export start a fresh pool
+        _discard_pdf_pool(pool)
+        raise
+    except FutureTimeoutError:
+        # A hung render would hold its worker forever: drop the job if it is still
+        # queued, otherwise stop the workers and start a fresh pool next time
+        if not future.cancel():
+            logger.warning(f"PDF render exceeded {app_settings.PDF_TIMEOUT}s, restarting workers")
+            _discard_pdf_pool(pool, terminate=True)
+        raise
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor, terminate: bool = False) -> None:
+    """Shut down a worker pool so the next export creates a new one"""
+    global _PDF_POOL
+    
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    
+    # shutdown() forgets the worker processes, so collect them first
+    processes = list((pool._processes or {}).values()) if terminate else []
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
 class PDFExporter:
     """
     PDF export using WeasyPrint
     """
     
-    def __init__(self):
-        self.font_config = FontConfiguration() if HAS_WEASYPRINT else None
+    # Font discovery is expensive and cached stylesheets are parsed against one
+    # configuration, so a single instance is shared per process and built on first use
+    _font_config = None
+    _font_config_lock = threading.Lock()
+    
+    @classmethod
+    def get_font_config(cls) -> "FontConfiguration":
+        """Shared font configuration for this process"""
+        if cls._font_config is None:
+            with cls._font_config_lock:
+                if cls._font_config is None:
+                    cls._font_config = FontConfiguration()
+        return cls._font_config
+    
+    @property
+    def font_config(self) -> "FontConfiguration":
+        return self.get_font_config()
     
     def export(self, cv_data: Dict[str, Any], template_html: str, 
               settings: ExportSettings) -> ExportResult:
         """Export CV to PDF format"""
         
-        if not HAS_WEASYPRINT:
+        if not _load_weasyprint():
             return ExportResult(
                 success=False,
                 error_message="WeasyPrint not installed. Install with: pip install weasyprint"
             )
         
         try:
-            start_time = datetime.now()
+            start_time = time.perf_counter_ns()
             
             # Generate CSS based on settings
             css_content = self._generate_pdf_css(settings)
             
-            # Create HTML object
-            html_doc = HTML(string=template_html)
-            css_doc = CSS(string=css_content, font_config=self.font_config)
+            # Linked stylesheets are fetched and parsed per render; print styles come from css_doc
+            if settings.strip_external_css:
+                template_html = _STYLESHEET_LINK_PATTERN.sub('', template_html)
             
-            # Generate PDF
-            pdf_buffer = io.BytesIO()
-            html_doc.write_pdf(pdf_buffer, stylesheets=[css_doc], font_config=self.font_config)
+            # Optimize embedded images; lossy JPEG re-encoding only below high quality
+            image_options = {}
+            if settings.compress:
+                image_options["optimize_images"] = True
+                if settings.quality not in (ExportQuality.HIGH, ExportQuality.PRINT):
+                    image_options["jpeg_quality"] = PDF_JPEG_QUALITY
             
-            pdf_data = pdf_buffer.getvalue()
-            pdf_buffer.close()
+            # Generate PDF, in a warm worker process unless workers are disabled
+            if app_settings.PDF_WORKERS > 0:
+                pdf_data, page_count = _render_pdf_in_pool(template_html, css_content, image_options)
+            else:
+                pdf_data, page_count = _render_pdf(template_html, css_content, image_options)
             
-            generation_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
             # Generate filename
-            name = cv_data.get("personal_details", {}).get("full_name", "CV")
-            filename = f"{name.replace(' ', '_')}_CV.pdf"
+            filename = _safe_filename(cv_data, "pdf")
             
             return ExportResult(
                 success=True,
@@ -139,7 +635,7 @@ class PDFExporter:
                 file_size=len(pdf_data),
                 generation_time_ms=generation_time,
                 metadata={
-                    "page_count": self._get_pdf_page_count(pdf_data),
+                    "page_count": max(1, page_count),
                     "template": settings.template,
                     "quality": settings.quality.value
                 }
@@ -155,102 +651,84 @@ class PDFExporter:
     def _generate_pdf_css(self, settings: ExportSettings) -> str:
         """Generate CSS for PDF styling"""
         
-        page_size = settings.page_size.lower()
         margins = settings.margins
-        
-        css = f"""
-        @page {{
-            size: {page_size};
-            margin-top: {margins['top']}mm;
-            margin-bottom: {margins['bottom']}mm;
-            margin-left: {margins['left']}mm;
-            margin-right: {margins['right']}mm;
-        }}
-        
-        body {{
-            font-family: '{settings.font_family}', Arial, sans-serif;
-            font-size: {settings.font_size}pt;
-            line-height: {settings.line_spacing};
-            color: #000;
-            margin: 0;
-            padding: 0;
-        }}
-        
-        .template-container {{
-            width: 100%;
-            max-width: none;
-            margin: 0;
-            box-shadow: none;
-        }}
-        
-        /* Print-specific styles */
-        * {{
-            print-color-adjust: exact;
-            -webkit-print-color-adjust: exact;
-        }}
-        
-        .no-break {{
-            page-break-inside: avoid;
-        }}
-        
-        .page-break {{
-            page-break-before: always;
-        }}
-        
-        h1, h2, h3 {{
-            page-break-after: avoid;
-        }}
-        
-        /* Ensure colors print correctly */
-        .header {{
-            background: #3182ce !important;
-            color: white !important;
-        }}
-        
-        .skill-item {{
-            background: #3182ce !important;
-            color: white !important;
-        }}
-        """
-        
-        # Quality-specific adjustments
-        if settings.quality == ExportQuality.HIGH or settings.quality == ExportQuality.PRINT:
-            css += """
-            body {
-                font-size: 12pt;
-                line-height: 1.3;
-            }
-            
-            .section-title {
-                font-size: 14pt;
-            }
-            
-            .header-name {
-                font-size: 24pt;
-            }
-            """
-        
-        # Add watermark if specified
-        if settings.watermark:
-            css += f"""
-            @page {{
-                background-image: url("data:image/svg+xml;charset=utf-8,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 400 200'%3E%3Ctext x='50%25' y='50%25' text-anchor='middle' font-size='40' fill='%23f0f0f0' opacity='0.3' transform='rotate(-45 200 100)'%3E{settings.watermark}%3C/text%3E%3C/svg%3E");
-                background-repeat: repeat;
-                background-position: center;
-            }}
-            """
-        
-        return css
+        return self._render_pdf_css(
+            settings.quality, settings.page_size,
+            margins['top'], margins['bottom'], margins['left'], margins['right'],
+            settings.font_family, settings.font_size, settings.line_spacing,
+            settings.watermark
+        )
     
-    def _get_pdf_page_count(self, pdf_data: bytes) -> int:
-        """Get number of pages in PDF (simplified implementation)"""
-        try:
-            # This is a very basic implementation
-            # In practice, you'd use a proper PDF library like PyPDF2
-            page_count = pdf_data.count(b'/Type /Page')
-            return max(1, page_count)
-        except:
-            return 1
+    @staticmethod
+    @lru_cache(maxsize=PDF_CSS_CACHE_SIZE)
+    def _render_pdf_css(quality: ExportQuality, page_size: str,
+                        top: float, bottom: float, left: float, right: float,
+                        font_family: str, font_size: int, line_spacing: float,
+                        watermark: Optional[str]) -> str:
+        """Render the PDF stylesheet for one combination of settings"""
+        
+        return _PDF_CSS_TEMPLATE.format_map({
+            "page_size": page_size.lower(),
+            "top": top,
+            "bottom": bottom,
+            "left": left,
+            "right": right,
+            "font_family": font_family,
+            "font_size": font_size,
+            "line_spacing": line_spacing,
+            # Quality-specific adjustments
+            "quality_overrides": _PDF_HIGH_QUALITY_CSS if quality in (ExportQuality.HIGH, ExportQuality.PRINT) else "",
+            # Add watermark if specified
+            "watermark_rule": _PDF_WATERMARK_CSS.format(watermark=watermark) if watermark else ""
+        })
+    
+    @staticmethod
+    @lru_cache(maxsize=PDF_CSS_CACHE_SIZE)
+    def _compiled_pdf_css(css_content: str) -> "CSS":
+        """Parse a generated stylesheet once and reuse it across renders"""
+        return CSS(string=css_content, font_config=PDFExporter.get_font_config())
+
+def _run_properties(*tags: str):
+    """Build a <w:rPr> element with the given toggle properties"""
+    run_properties = OxmlElement('w:rPr')
+    for tag in tags:
+        run_properties.append(OxmlElement(tag))
+    return run_properties
+
+# Run formatting templates keyed by (bold, italic), copied onto runs instead of set via
+# font proxies; built by _load_docx
+_RUN_PROPERTIES: Dict[Tuple[bool, bool], Any] = {}
+
+def _docx_run(text: Optional[str], bold: bool = False, italic: bool = False):
+    """Build a <w:r> element, as Paragraph.add_run would"""
+    
+    run = OxmlElement('w:r')
+    if bold or italic:
+        run.append(copy.deepcopy(_RUN_PROPERTIES[bold, italic]))
+    
+    if text:
+        run.text = text
+    return run
+
+def _docx_paragraph(style_id: str, *runs, left_indent=None):
+    """Build a styled <w:p> element holding the given runs"""
+    
+    paragraph = OxmlElement('w:p')
+    paragraph_properties = paragraph.get_or_add_pPr()
+    paragraph_properties.style = style_id
+    if left_indent is not None:
+        paragraph_properties.ind_left = left_indent
+    
+    paragraph.extend(runs)
+    return paragraph
+
+def _append_docx_body(doc: "Document", paragraphs: List[Any]):
+    """Attach paragraphs to the end of the document body, ahead of its section properties"""
+    
+    body = doc.element.body
+    section_properties = body.sectPr
+    position = body.index(section_properties) if section_properties is not None else len(body)
+    body[position:position] = paragraphs
 
 class DOCXExporter:
     """
@@ -258,44 +736,42 @@ class DOCXExporter:
     """
     
     def __init__(self):
-        pass
+        self._skeletons: Dict[tuple, bytes] = _BoundedCache(DOCX_SKELETON_CACHE_SIZE)
     
     def export(self, cv_data: Dict[str, Any], template_html: str, 
               settings: ExportSettings) -> ExportResult:
         """Export CV to DOCX format"""
         
-        if not HAS_DOCX:
+        if not _load_docx():
             return ExportResult(
                 success=False,
                 error_message="python-docx not installed. Install with: pip install python-docx"
             )
         
         try:
-            start_time = datetime.now()
-            
-            # Create document
-            doc = Document()
+            start_time = time.perf_counter_ns()
             
-            # Set up styles
-            self._setup_docx_styles(doc, settings)
+            # Create document with margins and styles already set up
+            doc = self._new_document(settings)
             
             # Add content
-            self._add_header_section(doc, cv_data.get("personal_details", {}), settings)
+            cv = _coerce_cv(cv_data)
+            self._add_header_section(doc, cv.personal, settings)
             
-            if cv_data.get("professional_summary"):
-                self._add_summary_section(doc, cv_data["professional_summary"])
+            if cv.summary:
+                self._add_summary_section(doc, cv.summary)
             
-            if cv_data.get("skills"):
-                self._add_skills_section(doc, cv_data["skills"])
+            if cv.skills:
+                self._add_skills_section(doc, cv.skills)
             
-            if cv_data.get("work_experience"):
-                self._add_experience_section(doc, cv_data["work_experience"])
+            if cv.experience:
+                self._add_experience_section(doc, cv.experience)
             
-            if cv_data.get("education"):
-                self._add_education_section(doc, cv_data["education"])
+            if cv.education:
+                self._add_education_section(doc, cv.education)
             
-            if cv_data.get("projects"):
-                self._add_projects_section(doc, cv_data["projects"])
+            if cv.projects:
+                self._add_projects_section(doc, cv.projects)
             
             # Save to buffer
             docx_buffer = io.BytesIO()
@@ -303,11 +779,10 @@ class DOCXExporter:
             docx_data = docx_buffer.getvalue()
             docx_buffer.close()
             
-            generation_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
             # Generate filename
-            name = cv_data.get("personal_details", {}).get("full_name", "CV")
-            filename = f"{name.replace(' ', '_')}_CV.docx"
+            filename = _safe_filename(cv_data, "docx")
             
             return ExportResult(
                 success=True,
@@ -330,7 +805,25 @@ class DOCXExporter:
                 error_message=f"DOCX generation failed: {str(e)}"
             )
     
-    def _setup_docx_styles(self, doc: Document, settings: ExportSettings):
+    def _new_document(self, settings: ExportSettings) -> "Document":
+        """Create a document from the cached, pre-styled skeleton for these settings"""
+        
+        margins = settings.margins
+        key = (settings.font_family, settings.font_size,
+               margins["top"], margins["bottom"], margins["left"], margins["right"])
+        
+        skeleton = self._skeletons.get(key)
+        if skeleton is None:
+            doc = Document()
+            self._setup_docx_styles(doc, settings)
+            skeleton_buffer = io.BytesIO()
+            doc.save(skeleton_buffer)
+            skeleton = skeleton_buffer.getvalue()
+            self._skeletons[key] = skeleton
+        
+        return Document(io.BytesIO(skeleton))
+    
+    def _setup_docx_styles(self, doc: "Document", settings: ExportSettings):
         """Set up document styles"""
         
         # Document margins
@@ -343,9 +836,10 @@ class DOCXExporter:
         
         # Create custom styles
         styles = doc.styles
+        existing_styles = {style.name for style in styles}
         
         # Header style
-        if 'CV Header' not in [style.name for style in styles]:
+        if 'CV Header' not in existing_styles:
             header_style = styles.add_style('CV Header', WD_STYLE_TYPE.PARAGRAPH)
             header_font = header_style.font
             header_font.name = settings.font_family
@@ -354,7 +848,7 @@ class DOCXExporter:
             header_style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
         # Section heading style
-        if 'CV Section' not in [style.name for style in styles]:
+        if 'CV Section' not in existing_styles:
             section_style = styles.add_style('CV Section', WD_STYLE_TYPE.PARAGRAPH)
             section_font = section_style.font
             section_font.name = settings.font_family
@@ -363,13 +857,13 @@ class DOCXExporter:
             section_font.color.rgb = None  # Blue color would be set here
         
         # Body style
-        if 'CV Body' not in [style.name for style in styles]:
+        if 'CV Body' not in existing_styles:
             body_style = styles.add_style('CV Body', WD_STYLE_TYPE.PARAGRAPH)
             body_font = body_style.font
             body_font.name = settings.font_family
             body_font.size = Pt(settings.font_size)
     
-    def _add_header_section(self, doc: Document, personal_details: Dict[str, Any], 
+    def _add_header_section(self, doc: "Document", personal_details: Dict[str, Any], 
                            settings: ExportSettings):
         """Add header section with personal details"""
         
@@ -403,102 +897,118 @@ class DOCXExporter:
         # Add spacing
         doc.add_paragraph()
     
-    def _add_summary_section(self, doc: Document, summary: str):
+    def _add_summary_section(self, doc: "Document", summary: str):
         """Add professional summary section"""
         
         doc.add_paragraph("PROFESSIONAL SUMMARY", style='CV Section')
         doc.add_paragraph(summary, style='CV Body')
         doc.add_paragraph()
     
-    def _add_skills_section(self, doc: Document, skills: Dict[str, List[str]]):
+    def _add_skills_section(self, doc: "Document", skills: Dict[str, List[str]]):
         """Add skills section"""
         
         doc.add_paragraph("TECHNICAL SKILLS", style='CV Section')
         
+        body_style = doc.styles['CV Body'].style_id
+        paragraphs = []
+        
         for category, skill_list in skills.items():
             if skill_list:
-                skills_para = doc.add_paragraph(style='CV Body')
-                skills_para.add_run(f"{category.title()}: ").font.bold = True
-                skills_para.add_run(", ".join(skill_list))
-        
-        doc.add_paragraph()
+                paragraphs.append(_docx_paragraph(
+                    body_style,
+                    _docx_run(f"{category.title()}: ", bold=True),
+                    _docx_run(", ".join(skill_list))
+                ))
+        
+        paragraphs.append(OxmlElement('w:p'))
+        _append_docx_body(doc, paragraphs)
     
-    def _add_experience_section(self, doc: Document, experience: List[Dict[str, Any]]):
+    def _add_experience_section(self, doc: "Document", experience: List[_ExperienceEntry]):
         """Add work experience section"""
         
         doc.add_paragraph("WORK EXPERIENCE", style='CV Section')
         
+        # Build the whole section as XML and attach it in one step; this is the
+        # longest section and python-docx's per-paragraph proxies dominate its cost
+        body_style = doc.styles['CV Body'].style_id
+        indent = Inches(0.25)
+        paragraphs = []
+        
         for exp in experience:
             # Job header
-            job_para = doc.add_paragraph(style='CV Body')
-            job_para.add_run(exp.get("job_title", "")).font.bold = True
-            job_para.add_run(f" | {exp.get('company', '')}")
-            
-            # Dates
-            date_para = doc.add_paragraph(style='CV Body')
-            start_date = exp.get("start_date", "")
-            end_date = exp.get("end_date", "Present") if not exp.get("is_current") else "Present"
-            date_para.add_run(f"{start_date} - {end_date}").font.italic = True
-            
-            # Location
-            if exp.get("location"):
-                date_para.add_run(f" | {exp['location']}").font.italic = True
+            paragraphs.append(_docx_paragraph(
+                body_style,
+                _docx_run(exp.job_title, bold=True),
+                _docx_run(f" | {exp.company}")
+            ))
+            
+            # Dates and location
+            date_runs = [_docx_run(f"{exp.start_date} - {exp.end_date}", italic=True)]
+            if exp.location:
+                date_runs.append(_docx_run(f" | {exp.location}", italic=True))
+            paragraphs.append(_docx_paragraph(body_style, *date_runs))
             
             # Achievements
-            if exp.get("achievements"):
-                for achievement in exp["achievements"]:
-                    achievement_para = doc.add_paragraph(f"• {achievement}", style='CV Body')
-                    achievement_para.paragraph_format.left_indent = Inches(0.25)
+            for achievement in exp.achievements:
+                paragraphs.append(_docx_paragraph(
+                    body_style, _docx_run(f"• {achievement}"), left_indent=indent
+                ))
             
-            doc.add_paragraph()
+            paragraphs.append(OxmlElement('w:p'))
+        
+        _append_docx_body(doc, paragraphs)
     
-    def _add_education_section(self, doc: Document, education: List[Dict[str, Any]]):
+    def _add_education_section(self, doc: "Document", education: List[_EducationEntry]):
         """Add education section"""
         
         doc.add_paragraph("EDUCATION", style='CV Section')
         
+        body_style = doc.styles['CV Body'].style_id
+        paragraphs = []
+        
         for edu in education:
-            edu_para = doc.add_paragraph(style='CV Body')
-            edu_para.add_run(edu.get("degree", "")).font.bold = True
-            edu_para.add_run(f" | {edu.get('institution', '')}")
+            paragraphs.append(_docx_paragraph(
+                body_style,
+                _docx_run(edu.degree, bold=True),
+                _docx_run(f" | {edu.institution}")
+            ))
             
             # Dates and grade
-            details = []
-            if edu.get("start_date") or edu.get("end_date"):
-                start = edu.get("start_date", "")
-                end = edu.get("end_date", "")
-                if start or end:
-                    details.append(f"{start} - {end}" if start and end else start or end)
-            
-            if edu.get("grade"):
-                details.append(edu["grade"])
-            
-            if details:
-                details_para = doc.add_paragraph(" | ".join(details), style='CV Body')
-                details_para.runs[0].font.italic = True
+            if edu.details:
+                paragraphs.append(_docx_paragraph(
+                    body_style, _docx_run(" | ".join(edu.details), italic=True)
+                ))
         
-        doc.add_paragraph()
+        paragraphs.append(OxmlElement('w:p'))
+        _append_docx_body(doc, paragraphs)
     
-    def _add_projects_section(self, doc: Document, projects: List[Dict[str, Any]]):
+    def _add_projects_section(self, doc: "Document", projects: List[_ProjectEntry]):
         """Add projects section"""
         
         doc.add_paragraph("KEY PROJECTS", style='CV Section')
         
-        for project in projects:
-            project_para = doc.add_paragraph(style='CV Body')
-            project_para.add_run(project.get("name", "")).font.bold = True
-            
-            if project.get("description"):
-                desc_para = doc.add_paragraph(project["description"], style='CV Body')
-                desc_para.paragraph_format.left_indent = Inches(0.25)
-            
-            if project.get("technologies"):
-                tech_para = doc.add_paragraph(style='CV Body')
-                tech_para.paragraph_format.left_indent = Inches(0.25)
-                tech_para.add_run("Technologies: ").font.italic = True
-                tech_para.add_run(", ".join(project["technologies"]))
+        body_style = doc.styles['CV Body'].style_id
+        indent = Inches(0.25)
+        paragraphs = []
         
-        doc.add_paragraph()
+        for project in projects:
+            paragraphs.append(_docx_paragraph(body_style, _docx_run(project.name, bold=True)))
+            
+            if project.description:
+                paragraphs.append(_docx_paragraph(
+                    body_style, _docx_run(project.description), left_indent=indent
+                ))
+            
+            if project.technologies:
+                paragraphs.append(_docx_paragraph(
+                    body_style,
+                    _docx_run("Technologies: ", italic=True),
+                    _docx_run(", ".join(project.technologies)),
+                    left_indent=indent
+                ))
+        
+        paragraphs.append(OxmlElement('w:p'))
+        _append_docx_body(doc, paragraphs)
     
     def _estimate_word_count(self, cv_data: Dict[str, Any]) -> int:
         """Estimate word count in CV"""
@@ -528,133 +1038,128 @@ class TXTExporter:
         """Export CV to plain text format"""
         
         try:
-            start_time = datetime.now()
-            
-            # Build text content
-            text_lines = []
+            start_time = time.perf_counter_ns()
+            
+            # Encode each entry straight into the output buffer, counting entries,
+            # characters and words as they are written; every entry ends in a
+            # newline, so no word spans two entries
+            out = bytearray()
+            entry_count = 0
+            char_count = 0
+            word_count = 0
+            
+            def w(line: str) -> None:
+                nonlocal entry_count, char_count, word_count
+                entry_count += 1
+                char_count += len(line) + 1
+                word_count += len(line.split())
+                out.extend(line.encode('utf-8'))
+                out.extend(b"\n")
+            
+            cv = _coerce_cv(cv_data)
             
             # Header
-            personal = cv_data.get("personal_details", {})
+            personal = cv.personal
             if personal.get("full_name"):
-                text_lines.append(personal["full_name"].upper())
-                text_lines.append("=" * len(personal["full_name"]))
+                w(personal['full_name'].upper())
+                w("=" * len(personal["full_name"]))
             
             if personal.get("desired_position"):
-                text_lines.append(personal["desired_position"])
+                w(f"{personal['desired_position']}")
             
             # Contact info
             if settings.include_contact_info:
-                contact_info = []
                 if personal.get("phone"):
-                    contact_info.append(f"Phone: {personal['phone']}")
+                    w(f"Phone: {personal['phone']}")
                 if personal.get("email"):
-                    contact_info.append(f"Email: {personal['email']}")
+                    w(f"Email: {personal['email']}")
                 if personal.get("location"):
-                    contact_info.append(f"Location: {personal['location']}")
+                    w(f"Location: {personal['location']}")
                 if personal.get("linkedin_url"):
-                    contact_info.append(f"LinkedIn: {personal['linkedin_url']}")
-                
-                if contact_info:
-                    text_lines.extend(contact_info)
+                    w(f"LinkedIn: {personal['linkedin_url']}")
             
-            text_lines.append("")
+            w("")
             
             # Professional Summary
-            if cv_data.get("professional_summary"):
-                text_lines.append("PROFESSIONAL SUMMARY")
-                text_lines.append("-" * 20)
-                text_lines.append(cv_data["professional_summary"])
-                text_lines.append("")
+            if cv.summary:
+                w("PROFESSIONAL SUMMARY")
+                w("-" * 20)
+                w(cv.summary)
+                w("")
             
             # Skills
-            if cv_data.get("skills"):
-                text_lines.append("TECHNICAL SKILLS")
-                text_lines.append("-" * 16)
-                for category, skill_list in cv_data["skills"].items():
+            if cv.skills:
+                w("TECHNICAL SKILLS")
+                w("-" * 16)
+                for category, skill_list in cv.skills.items():
                     if skill_list:
-                        text_lines.append(f"{category.title()}: {', '.join(skill_list)}")
-                text_lines.append("")
+                        w(f"{category.title()}: {', '.join(skill_list)}")
+                w("")
             
             # Work Experience
-            if cv_data.get("work_experience"):
-                text_lines.append("WORK EXPERIENCE")
-                text_lines.append("-" * 15)
+            if cv.experience:
+                w("WORK EXPERIENCE")
+                w("-" * 15)
                 
-                for exp in cv_data["work_experience"]:
+                for exp in cv.experience:
                     # Job header
-                    job_title = exp.get("job_title", "")
-                    company = exp.get("company", "")
-                    text_lines.append(f"{job_title} | {company}")
+                    w(f"{exp.job_title} | {exp.company}")
                     
                     # Dates and location
                     date_info = []
-                    start_date = exp.get("start_date", "")
-                    end_date = exp.get("end_date", "Present") if not exp.get("is_current") else "Present"
-                    if start_date:
-                        date_info.append(f"{start_date} - {end_date}")
-                    if exp.get("location"):
-                        date_info.append(exp["location"])
+                    if exp.start_date:
+                        date_info.append(f"{exp.start_date} - {exp.end_date}")
+                    if exp.location:
+                        date_info.append(exp.location)
                     
                     if date_info:
-                        text_lines.append(" | ".join(date_info))
+                        w(" | ".join(date_info))
                     
                     # Achievements
-                    if exp.get("achievements"):
-                        for achievement in exp["achievements"]:
-                            text_lines.append(f"• {achievement}")
+                    if exp.achievements:
+                        for achievement in exp.achievements:
+                            w(f"• {achievement}")
                     
-                    text_lines.append("")
+                    w("")
             
             # Education
-            if cv_data.get("education"):
-                text_lines.append("EDUCATION")
-                text_lines.append("-" * 9)
+            if cv.education:
+                w("EDUCATION")
+                w("-" * 9)
                 
-                for edu in cv_data["education"]:
-                    degree = edu.get("degree", "")
-                    institution = edu.get("institution", "")
-                    text_lines.append(f"{degree} | {institution}")
-                    
-                    details = []
-                    if edu.get("start_date") or edu.get("end_date"):
-                        start = edu.get("start_date", "")
-                        end = edu.get("end_date", "")
-                        if start or end:
-                            details.append(f"{start} - {end}" if start and end else start or end)
+                for edu in cv.education:
+                    w(f"{edu.degree} | {edu.institution}")
                     
-                    if edu.get("grade"):
-                        details.append(edu["grade"])
+                    if edu.details:
+                        w(" | ".join(edu.details))
                     
-                    if details:
-                        text_lines.append(" | ".join(details))
-                    
-                    text_lines.append("")
+                    w("")
             
             # Projects
-            if cv_data.get("projects"):
-                text_lines.append("KEY PROJECTS")
-                text_lines.append("-" * 12)
+            if cv.projects:
+                w("KEY PROJECTS")
+                w("-" * 12)
                 
-                for project in cv_data["projects"]:
-                    text_lines.append(project.get("name", ""))
+                for project in cv.projects:
+                    w(f"{project.name}")
                     
-                    if project.get("description"):
-                        text_lines.append(f"Description: {project['description']}")
+                    if project.description:
+                        w(f"Description: {project.description}")
                     
-                    if project.get("technologies"):
-                        text_lines.append(f"Technologies: {', '.join(project['technologies'])}")
+                    if project.technologies:
+                        w(f"Technologies: {', '.join(project.technologies)}")
                     
-                    text_lines.append("")
+                    w("")
             
-            # Join all lines
-            text_content = "\n".join(text_lines)
-            text_data = text_content.encode('utf-8')
+            # Lines are newline-separated, not terminated
+            del out[-1]
+            char_count -= 1
+            text_data = bytes(out)
             
-            generation_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
             # Generate filename
-            name = cv_data.get("personal_details", {}).get("full_name", "CV")
-            filename = f"{name.replace(' ', '_')}_CV.txt"
+            filename = _safe_filename(cv_data, "txt")
             
             return ExportResult(
                 success=True,
@@ -664,9 +1169,9 @@ class TXTExporter:
                 file_size=len(text_data),
                 generation_time_ms=generation_time,
                 metadata={
-                    "line_count": len(text_lines),
-                    "character_count": len(text_content),
-                    "word_count": len(text_content.split())
+                    "line_count": entry_count,
+                    "character_count": char_count,
+                    "word_count": word_count
                 }
             )
             
@@ -687,18 +1192,17 @@ class HTMLExporter:
         """Export CV to HTML format"""
         
         try:
-            start_time = datetime.now()
+            start_time = time.perf_counter_ns()
             
             # Add inline CSS for standalone HTML
             standalone_html = self._make_standalone_html(template_html, settings)
             
             html_data = standalone_html.encode('utf-8')
             
-            generation_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
             # Generate filename
-            name = cv_data.get("personal_details", {}).get("full_name", "CV")
-            filename = f"{name.replace(' ', '_')}_CV.html"
+            filename = _safe_filename(cv_data, "html")
             
             return ExportResult(
                 success=True,
@@ -738,36 +1242,11 @@ class HTMLExporter:
 </body>
 </html>'''
         
-        # Add export-specific styles
-        export_css = """
-        <style>
-        /* Export optimizations */
-        * {
-            -webkit-print-color-adjust: exact;
-            print-color-adjust: exact;
-        }
-        
-        @media print {
-            body {
-                margin: 0;
-                padding: 0;
-            }
-            
-            .template-container {
-                box-shadow: none;
-                margin: 0;
-            }
-        }
-        
-        .export-note {
-            display: none;
-        }
-        </style>
-        """
-        
-        # Insert CSS before closing head tag
-        if '</head>' in template_html:
-            template_html = template_html.replace('</head>', f'{export_css}</head>')
+        # Insert export-specific styles before the closing head tag
+        head_end = _HEAD_END_PATTERN.search(template_html)
+        if head_end:
+            position = head_end.start()
+            template_html = template_html[:position] + _EXPORT_CSS + template_html[position:]
         
         return template_html
 
@@ -781,7 +1260,7 @@ class JSONExporter:
         """Export CV to JSON format"""
         
         try:
-            start_time = datetime.now()
+            start_time = time.perf_counter_ns()
             
             # Clean and structure data for export
             export_data = {
@@ -798,15 +1277,16 @@ class JSONExporter:
                 }
             }
             
-            # Convert to JSON
-            json_content = json.dumps(export_data, indent=2, ensure_ascii=False)
-            json_data = json_content.encode('utf-8')
+            # Convert to JSON, serializing straight to UTF-8 bytes when orjson is available
+            if HAS_ORJSON:
+                json_data = orjson.dumps(export_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                json_data = json.dumps(export_data, indent=2, ensure_ascii=False).encode('utf-8')
             
-            generation_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            generation_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
             # Generate filename
-            name = cv_data.get("personal_details", {}).get("full_name", "CV")
-            filename = f"{name.replace(' ', '_')}_CV.json"
+            filename = _safe_filename(cv_data, "json")
             
             return ExportResult(
                 success=True,
@@ -844,11 +1324,7 @@ class ExportService:
         }
         
         # Template loader
-        self.template_loader = None
-        if HAS_JINJA2:
-            template_dir = os.path.join(os.path.dirname(__file__), '..', 'templates')
-            if os.path.exists(template_dir):
-                self.template_loader = Environment(loader=FileSystemLoader(template_dir))
+        self.template_loader = _JINJA_ENV
     
     async def export_cv(self, cv_data: Dict[str, Any], settings: ExportSettings) -> ExportResult:
         """Export CV in the specified format"""
@@ -872,8 +1348,13 @@ class ExportService:
                         error_message=f"Failed to load template: {settings.template}"
                     )
             
-            # Perform export
-            result = exporter.export(cv_data, template_html, settings)
+            # Perform export in a worker thread so rendering does not block the event loop
+            result = await asyncio.to_thread(exporter.export, cv_data, template_html, settings)
+            
+            # Spool to a file the server can send with sendfile() instead of holding the bytes
+            if result.success and settings.streaming and result.file_data is not None:
+                result.file_path = await asyncio.to_thread(self._spool_export, result)
+                result.file_data = None
             
             # Add common metadata
             if result.success and result.metadata:
@@ -901,9 +1382,9 @@ class ExportService:
         if settings is None:
             settings = ExportSettings(format=formats[0])
         
-        results = {}
+        exports = []
         
-        # Export each format
+        # Export each format; the exporters share no state, so they run concurrently
         for format_type in formats:
             format_settings = ExportSettings(
                 format=format_type,
@@ -917,13 +1398,29 @@ class ExportService:
                 font_size=settings.font_size,
                 line_spacing=settings.line_spacing,
                 compress=settings.compress,
-                watermark=settings.watermark
+                watermark=settings.watermark,
+                strip_external_css=settings.strip_external_css,
+                streaming=settings.streaming
             )
-            
-            result = await self.export_cv(cv_data, format_settings)
-            results[format_type.value] = result
+            exports.append(self.export_cv(cv_data, format_settings))
         
-        return results
+        results = await asyncio.gather(*exports)
+        return {format_type.value: result for format_type, result in zip(formats, results)}
+    
+    def _spool_export(self, result: ExportResult) -> str:
+        """Write export bytes to a temporary file; the caller removes it once sent"""
+        
+        suffix = os.path.splitext(result.filename)[1]
+        spool_file = tempfile.NamedTemporaryFile(dir=EXPORT_SPOOL_DIR, prefix="cv_export_",
+                                                 suffix=suffix, delete=False)
+        try:
+            with spool_file:
+                spool_file.write(result.file_data)
+        except Exception:
+            # Don't leave a partial file behind, e.g. when the spool fills up
+            os.remove(spool_file.name)
+            raise
+        return spool_file.name
     
     async def _generate_template_html(self, cv_data: Dict[str, Any], template_name: str) -> str:
         """Generate HTML from template"""
@@ -931,13 +1428,11 @@ class ExportService:
         try:
             if self.template_loader:
                 # Use Jinja2 template
-                template = self.template_loader.get_template(f"{template_name}.html")
+                template = _get_template(f"{template_name}.html")
                 return template.render(**cv_data)
             else:
                 # Fallback: load template file directly
-                template_path = os.path.join(
-                    os.path.dirname(__file__), '..', 'templates', f"{template_name}.html"
-                )
+                template_path = os.path.join(TEMPLATE_DIR, f"{template_name}.html")
                 
                 if os.path.exists(template_path):
                     with open(template_path, 'r', encoding='utf-8') as f:
@@ -956,140 +1451,95 @@ class ExportService:
     def _simple_template_render(self, template_content: str, cv_data: Dict[str, Any]) -> str:
         """Simple template variable replacement"""
         
-        # Replace basic variables
+        if "{{" not in template_content:
+            return template_content
+        
+        # Flatten basic variables once, then substitute them in a single pass
+        values: Dict[str, str] = {}
         for key, value in cv_data.items():
             if isinstance(value, dict):
                 for subkey, subvalue in value.items():
-                    template_content = template_content.replace(
-                        f"{{{{ {key}.{subkey} }}}}", str(subvalue or "")
-                    )
+                    values.setdefault(f"{key}.{subkey}", str(subvalue or ""))
             else:
-                template_content = template_content.replace(
-                    f"{{{{ {key} }}}}", str(value or "")
-                )
+                values.setdefault(key, str(value or ""))
         
-        return template_content
+        # Unknown placeholders are left as they are
+        return _TEMPLATE_VAR_PATTERN.sub(
+            lambda match: values.get(match.group(1), match.group(0)), template_content
+        )
     
     def _generate_basic_html(self, cv_data: Dict[str, Any]) -> str:
         """Generate basic HTML structure"""
         
         personal = cv_data.get("personal_details", {})
         
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{personal.get('full_name', 'CV')}</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    line-height: 1.6;
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                    padding: 20px;
-                    background: #f8f9fa;
-                }}
-                .section {{
-                    margin-bottom: 25px;
-                }}
-                .section-title {{
-                    color: #333;
-                    border-bottom: 2px solid #333;
-                    padding-bottom: 5px;
-                    margin-bottom: 15px;
-                }}
-                .experience-item {{
-                    margin-bottom: 20px;
-                }}
-                .job-title {{
-                    font-weight: bold;
-                    font-size: 1.1em;
-                }}
-                .company {{
-                    color: #666;
-                    font-style: italic;
-                }}
-                .achievements {{
-                    margin-top: 10px;
-                }}
-                .achievement {{
-                    margin-left: 20px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{personal.get('full_name', '')}</h1>
-                <p>{personal.get('desired_position', '')}</p>
-                <p>{personal.get('email', '')} | {personal.get('phone', '')} | {personal.get('location', '')}</p>
-            </div>
-        """
+        parts = []
+        append = parts.append
+        
+        append(_BASIC_HTML_HEAD_TMPL.format_map({
+            "title": personal.get('full_name', 'CV'),
+            "full_name": personal.get('full_name', ''),
+            "desired_position": personal.get('desired_position', ''),
+            "email": personal.get('email', ''),
+            "phone": personal.get('phone', ''),
+            "location": personal.get('location', '')
+        }))
         
         # Professional Summary
         if cv_data.get("professional_summary"):
-            html += f"""
+            append(f"""
             <div class="section">
                 <h2 class="section-title">Professional Summary</h2>
                 <p>{cv_data['professional_summary']}</p>
             </div>
-            """
+            """)
         
         # Work Experience
         if cv_data.get("work_experience"):
-            html += """
+            append("""
             <div class="section">
                 <h2 class="section-title">Work Experience</h2>
-            """
+            """)
             
             for exp in cv_data["work_experience"]:
-                html += f"""
+                append(f"""
                 <div class="experience-item">
                     <div class="job-title">{exp.get('job_title', '')}</div>
                     <div class="company">{exp.get('company', '')}</div>
                     <div class="dates">{exp.get('start_date', '')} - {exp.get('end_date', 'Present')}</div>
-                """
+                """)
                 
                 if exp.get("achievements"):
-                    html += '<div class="achievements">'
+                    append('<div class="achievements">')
                     for achievement in exp["achievements"]:
-                        html += f'<div class="achievement">• {achievement}</div>'
-                    html += '</div>'
+                        append(f'<div class="achievement">• {achievement}</div>')
+                    append('</div>')
                 
-                html += '</div>'
+                append('</div>')
             
-            html += '</div>'
+            append('</div>')
         
         # Education
         if cv_data.get("education"):
-            html += """
+            append("""
             <div class="section">
                 <h2 class="section-title">Education</h2>
-            """
+            """)
             
             for edu in cv_data["education"]:
-                html += f"""
+                append(f"""
                 <div class="education-item">
                     <div class="degree">{edu.get('degree', '')}</div>
                     <div class="institution">{edu.get('institution', '')}</div>
                     <div class="dates">{edu.get('start_date', '')} - {edu.get('end_date', '')}</div>
                 </div>
-                """
+                """)
             
-            html += '</div>'
+            append('</div>')
         
-        html += """
-        </body>
-        </html>
-        """
+        append(_BASIC_HTML_TAIL)
         
-        return html
+        return "".join(parts)
     
     def get_supported_formats(self) -> List[Dict[str, Any]]:
         """Get list of supported export formats with capabilities"""
@@ -4,6 +4,8 @@ Core CV generation service using Google Gemini AI
 
 import json
 import base64
+import os
+from functools import lru_cache
 from typing import Dict, Any
 from datetime import datetime
 from io import BytesIO
@@ -17,15 +19,33 @@ try:
     from docx import Document
 except ImportError:
     Document = None
-from jinja2 import Environment, FileSystemLoader
-try:
-    from weasyprint import HTML
-except ImportError:
-    HTML = None
+from jinja2 import Environment, FileSystemLoader, Template
 
 from app.core.config import settings
+from app.core.jinja_cache import create_bytecode_cache
 from app.schemas.models import CVFormData, PDFResponse
 
+# Templates ship next to the services package, wherever the app is started from
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '..', 'templates')
+
+@lru_cache(maxsize=None)
+def _jinja_env() -> Environment:
+    """One environment per process, built on first use so its template cache outlives any service instance"""
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        # Kept apart from the export service's compiled code because autoescaping
+        # changes the generated code but not the cache key
+        bytecode_cache=create_bytecode_cache(pattern='__jinja2_generator_%s.cache'),
+        auto_reload=False,
+        cache_size=400
+    )
+
+@lru_cache(maxsize=None)
+def _get_template(name: str) -> Template:
+    """Resolve a template on first use; missing names raise and are not cached"""
+    return _jinja_env().get_template(name)
+
 
 class CVGeneratorService:
     """Service for generating CVs using AI"""
@@ -33,12 +53,11 @@ class CVGeneratorService:
     def __init__(self):
         self.gemini_api_key = settings.GEMINI_API_KEY
         self.gemini_url = f"https://generativelanguage.googleapis.com/v1beta/models/{settings.GEMINI_MODEL}:generateContent"
-        
-        # Initialize Jinja2 environment
-        self.jinja_env = Environment(
-            loader=FileSystemLoader('app/templates'),
-            autoescape=True
-        )
+    
+    @property
+    def jinja_env(self) -> Environment:
+        """Shared Jinja2 environment"""
+        return _jinja_env()
     
     async def generate_from_form(self, form_data: CVFormData) -> PDFResponse:
         """Generate CV from form data (Creator flow)"""
@@ -497,20 +516,19 @@ Output ONLY valid JSON in this exact format:
     
     async def _generate_pdfs(self, cv_data: Dict[str, Any]) -> tuple[bytes, bytes]:
         """Generate CV and cover letter PDFs"""
-        if HTML is None:
+        try:
+            # Imported here so the service loads without WeasyPrint's native libraries
+            from weasyprint import HTML
+        except (ImportError, OSError):
             raise Exception("PDF generation library not available. Please install weasyprint")
         try:
-            # Load templates (use enhanced template for better formatting)
-            cv_template = self.jinja_env.get_template('cv_template_enhanced.html')
-            letter_template = self.jinja_env.get_template('letter_template.html')
-            
             # Add current date for cover letter
             template_data = cv_data.copy()
             template_data['generation_date'] = datetime.now().strftime("%B %d, %Y")
             
             # Render HTML
-            cv_html = cv_template.render(**template_data)
-            letter_html = letter_template.render(**template_data)
+            cv_html = _get_template('cv_template_enhanced.html').render(**template_data)
+            letter_html = _get_template('letter_template.html').render(**template_data)
             
             # Generate PDFs
             cv_pdf = HTML(string=cv_html).write_pdf()
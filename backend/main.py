@@ -2,9 +2,11 @@
 CVGenius Backend - FastAPI Application Entry Point
 """
 
+import importlib.util
 import os
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -14,6 +16,9 @@ from app.api.v1.endpoints import router as api_router
 from app.api.v1.endpoints_advanced import router as advanced_api_router
 from app.core.config import settings
 
+# For faster JSON responses; only availability matters, ORJSONResponse brings its own import
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
@@ -24,6 +29,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse if HAS_ORJSON else JSONResponse,
 )
 
 # Add rate limiting
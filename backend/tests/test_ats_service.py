@@ -0,0 +1,142 @@
+"""
+Regression checks pinning ATS scores to the original substring-matching results
+"""
+
+from app.services.ats_service import ATSService
+
+SAMPLE_CV = {
+    "personal_details": {
+        "full_name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "+1 555 123 4567",
+        "location": "Berlin",
+        "desired_position": "Senior Software Engineer"
+    },
+    "professional_summary": (
+        "Experienced engineer building distributed systems and data platforms. "
+        "Analytical, collaborative and results-driven, with a track record of cutting costs."
+    ),
+    "work_experience": [
+        {
+            "job_title": "Software Engineer",
+            "company": "Acme",
+            "start_date": "2019",
+            "end_date": "Present",
+            "achievements": [
+                "Increased deployment frequency by 40% across 12 services",
+                "Handled database migrations for 3 systems, reducing costs by $120,000",
+                "Mentored 5 engineers and led agile ceremonies"
+            ]
+        },
+        {
+            "job_title": "Developer",
+            "company": "Beta",
+            "start_date": "2016",
+            "end_date": "2019",
+            "achievements": [
+                "Developed web applications and APIs used by 2000 customers",
+                "Improved testing coverage and performance of cloud integrations"
+            ]
+        }
+    ],
+    "education": [
+        {"degree": "BSc Computer Science", "institution": "TU Berlin", "start_date": "2012", "end_date": "2016"}
+    ],
+    "skills": {
+        "technical": ["Python", "PostgreSQL", "Kubernetes"],
+        "soft": ["Leadership", "Problem-solving"]
+    }
+}
+
+
+def test_curated_keywords_match_inflected_words():
+    result = ATSService().analyze_ats_compatibility(SAMPLE_CV, "", "technology")
+    keywords = result.keyword_analysis
+    
+    assert result.overall_score == 78
+    assert keywords["overall_score"] == 45
+    assert keywords["action_verbs"]["found_verbs"] == ["developed", "improved", "increased", "led"]
+    assert keywords["soft_skills"]["found_skills"] == [
+        "analytical", "collaborative", "leadership", "problem-solving", "results-driven"
+    ]
+    # "costs" and "increased" contain the measurement words
+    assert keywords["measurements"]["measurement_words"] == ["cost", "increase", "performance", "results"]
+    # "systems", "applications" and "integrations" contain the industry keywords
+    assert keywords["industry_keywords"]["found_keywords"] == [
+        "software", "database", "system", "application", "web", "cloud", "api",
+        "integration", "testing", "deployment", "agile", "data"
+    ]
+
+
+def test_business_scores_match_baseline():
+    result = ATSService().analyze_ats_compatibility(SAMPLE_CV, "", "business")
+    
+    assert result.overall_score == 67
+    assert result.keyword_analysis["overall_score"] == 19
+    assert result.keyword_analysis["industry_keywords"]["found_keywords"] == ["customer"]
+
+
+SAMPLE_JOB = (
+    "Experienced software engineer wanted to design cloud systems. You will develop APIs, "
+    "improve deployment pipelines and mentor engineers in an agile team."
+)
+
+
+def test_job_keywords_match_as_substrings_of_cv_text():
+    result = ATSService().analyze_ats_compatibility(SAMPLE_CV, SAMPLE_JOB, "technology")
+    job_matching = result.keyword_analysis["job_matching"]
+    
+    assert result.overall_score == 79
+    assert result.keyword_analysis["overall_score"] == 49
+    assert job_matching["match_percentage"] == 70.6
+    # "developed", "improved" and "mentored" in the CV satisfy the job keywords
+    for keyword in ("develop", "improve", "mentor"):
+        assert keyword in job_matching["matched_keywords"]
+
+
+def test_overlapping_metrics_count_for_every_pattern():
+    cv = {
+        "professional_summary": (
+            "Sales lead for consumer electronics accounts across northern Europe, "
+            "working with retail partners on product launches and trade shows."
+        ),
+        "work_experience": [
+            {
+                "job_title": "Account Manager",
+                "company": "Gamma",
+                "achievements": ["Generated $5m in revenue and increased by 20% over 3 years"]
+            }
+        ]
+    }
+    measurements = ATSService().keyword_analyzer.analyze_keywords(cv, "", "technology")["measurements"]
+    
+    # "$5" and "5m", "20%" and "increased by 20" each score separately
+    assert measurements["metric_count"] == 5
+    assert measurements["found_metrics"] == ["20%", "$5", "5m", "3 years", "increased by 20"]
+    assert measurements["score"] == 56
+
+
+def test_sample_cv_measurements_match_baseline():
+    measurements = ATSService().analyze_ats_compatibility(SAMPLE_CV, "", "technology").keyword_analysis["measurements"]
+    
+    assert measurements["metric_count"] == 3
+    assert measurements["found_metrics"] == ["40%", "$120,000", "2000 customers"]
+    assert measurements["score"] == 42
+
+
+def test_keyword_automaton_matches_substring_scan():
+    analyzer = ATSService().keyword_analyzer
+    text = analyzer._extract_all_text(SAMPLE_CV).lower()
+    hits = analyzer._match_keywords(text)
+    
+    analyzer._keyword_automaton = None
+    assert analyzer._match_keywords(text) == hits
+
+
+def test_job_phrases_keep_their_case():
+    job = "Design Cloud Systems. You will mentor engineers."
+    job_matching = ATSService().analyze_ats_compatibility(SAMPLE_CV, job, "technology").keyword_analysis["job_matching"]
+    
+    assert "Design Cloud Systems" in job_matching["job_keywords"]
+    assert "Design Cloud Systems" in job_matching["missing_keywords"]
+    assert "cloud" in job_matching["matched_keywords"]
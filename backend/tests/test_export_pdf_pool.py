@@ -0,0 +1,154 @@
+"""
+PDF worker pool: in-process fallbacks and recovery from broken or hung workers
+"""
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import export_service
+from app.services.export_service import ExportFormat, ExportSettings, PDFExporter
+
+CV = {"personal_details": {"full_name": "Jane Doe"}}
+HTML = "<html><body><p>CV</p></body></html>"
+SETTINGS = ExportSettings(format=ExportFormat.PDF)
+
+
+class FakeProcess:
+    def __init__(self):
+        self.terminated = False
+    
+    def terminate(self):
+        self.terminated = True
+
+
+class FakePool:
+    """Stands in for ProcessPoolExecutor; every job gets the given future"""
+    
+    def __init__(self, future: Future):
+        self.future = future
+        self.submitted = 0
+        self.shut_down = False
+        self._processes = {1: FakeProcess()}
+    
+    def submit(self, fn, *args):
+        self.submitted += 1
+        return self.future
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+        self._processes = None
+
+
+@pytest.fixture
+def pdf_env(monkeypatch):
+    """Fresh pool state, WeasyPrint reported present and in-process renders recorded"""
+    rendered = []
+    
+    def fake_render(template_html, css_content, image_options):
+        rendered.append(template_html)
+        return b"%PDF-in-process", 1
+    
+    monkeypatch.setattr(export_service, "_PDF_POOL", None)
+    monkeypatch.setattr(export_service, "_PDF_POOL_UNAVAILABLE", False)
+    monkeypatch.setattr(export_service, "_load_weasyprint", lambda: True)
+    monkeypatch.setattr(export_service, "_render_pdf", fake_render)
+    monkeypatch.setattr(export_service.app_settings, "PDF_WORKERS", 2)
+    return rendered
+
+
+def _use_pools(monkeypatch, *pools):
+    """Hand out the given pools, in order, whenever a ProcessPoolExecutor is created"""
+    remaining = list(pools)
+    monkeypatch.setattr(export_service, "ProcessPoolExecutor", lambda **kwargs: remaining.pop(0))
+
+
+def _completed(value) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def test_no_workers_renders_in_process(pdf_env, monkeypatch):
+    monkeypatch.setattr(export_service.app_settings, "PDF_WORKERS", 0)
+    _use_pools(monkeypatch)  # creating a pool would fail the test
+    
+    result = PDFExporter().export(CV, HTML, SETTINGS)
+    
+    assert result.success
+    assert result.file_data == b"%PDF-in-process"
+    assert pdf_env == [HTML]
+    assert export_service._PDF_POOL is None
+
+
+def test_pool_unavailable_falls_back_to_in_process(pdf_env, monkeypatch):
+    def no_semaphores(**kwargs):
+        raise OSError("no sem_open")
+    monkeypatch.setattr(export_service, "ProcessPoolExecutor", no_semaphores)
+    
+    first = PDFExporter().export(CV, HTML, SETTINGS)
+    second = PDFExporter().export(CV, HTML, SETTINGS)
+    
+    assert first.success and second.success
+    assert len(pdf_env) == 2
+    assert export_service._PDF_POOL_UNAVAILABLE
+
+
+def test_pool_is_reused_between_exports(pdf_env, monkeypatch):
+    pool = FakePool(_completed((b"%PDF-worker", 2)))
+    _use_pools(monkeypatch, pool)
+    
+    for _ in range(2):
+        result = PDFExporter().export(CV, HTML, SETTINGS)
+        assert result.file_data == b"%PDF-worker"
+        assert result.metadata["page_count"] == 2
+    
+    assert pool.submitted == 2
+    assert pdf_env == []
+
+
+def test_broken_pool_is_replaced(pdf_env, monkeypatch):
+    broken = Future()
+    broken.set_exception(BrokenProcessPool("worker died"))
+    broken_pool = FakePool(broken)
+    fresh_pool = FakePool(_completed((b"%PDF-worker", 1)))
+    _use_pools(monkeypatch, broken_pool, fresh_pool)
+    
+    with pytest.raises(BrokenProcessPool):
+        export_service._render_pdf_in_pool(HTML, "", {})
+    assert broken_pool.shut_down
+    assert export_service._PDF_POOL is None
+    
+    assert export_service._render_pdf_in_pool(HTML, "", {}) == (b"%PDF-worker", 1)
+    assert export_service._PDF_POOL is fresh_pool
+
+
+def test_hung_render_recycles_the_pool(pdf_env, monkeypatch):
+    monkeypatch.setattr(export_service.app_settings, "PDF_TIMEOUT", 0)
+    running = Future()
+    running.set_running_or_notify_cancel()
+    hung_pool = FakePool(running)
+    worker = hung_pool._processes[1]
+    _use_pools(monkeypatch, hung_pool)
+    
+    with pytest.raises(FutureTimeoutError):
+        export_service._render_pdf_in_pool(HTML, "", {})
+    
+    assert hung_pool.shut_down
+    assert worker.terminated
+    assert export_service._PDF_POOL is None
+
+
+def test_queued_render_is_cancelled_on_timeout(pdf_env, monkeypatch):
+    monkeypatch.setattr(export_service.app_settings, "PDF_TIMEOUT", 0)
+    queued = Future()
+    pool = FakePool(queued)
+    _use_pools(monkeypatch, pool)
+    
+    with pytest.raises(FutureTimeoutError):
+        export_service._render_pdf_in_pool(HTML, "", {})
+    
+    assert queued.cancelled()
+    assert not pool.shut_down
+    assert export_service._PDF_POOL is pool
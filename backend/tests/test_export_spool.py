@@ -0,0 +1,60 @@
+"""
+Spooled exports must not outlive the response that sends them
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from app.api.v1.endpoints_advanced import SpooledFileResponse
+from app.services.export_service import ExportResult, ExportService
+
+
+def _spooled_result() -> ExportResult:
+    return ExportResult(success=True, file_data=b"cv", filename="cv.txt")
+
+
+def _send_file(response: SpooledFileResponse, send) -> None:
+    async def receive():
+        return {"type": "http.disconnect"}
+    
+    scope = {"type": "http", "method": "GET", "headers": []}
+    asyncio.run(response(scope, receive, send))
+
+
+def test_spooled_file_is_removed_after_sending():
+    path = ExportService()._spool_export(_spooled_result())
+    messages = []
+    
+    async def send(message):
+        messages.append(message)
+    
+    _send_file(SpooledFileResponse(path), send)
+    
+    assert messages[-1]["body"] == b"cv"
+    assert not os.path.exists(path)
+
+
+def test_spooled_file_is_removed_when_client_disconnects():
+    path = ExportService()._spool_export(_spooled_result())
+    
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise OSError("client went away")
+    
+    with pytest.raises(OSError):
+        _send_file(SpooledFileResponse(path), send)
+    
+    assert not os.path.exists(path)
+
+
+def test_failed_spool_write_leaves_no_file(monkeypatch, tmp_path):
+    monkeypatch.setattr("app.services.export_service.EXPORT_SPOOL_DIR", str(tmp_path))
+    result = _spooled_result()
+    result.file_data = "not bytes"
+    
+    with pytest.raises(TypeError):
+        ExportService()._spool_export(result)
+    
+    assert list(tmp_path.iterdir()) == []